@@ -0,0 +1,54 @@
+import traceback
+
+
+class TableActor:
+    """The one writer of a table's state
+
+    Socket handlers, routes and follow-up steps submit commands instead of
+    touching the table themselves. A single background task runs them in
+    the order they arrived, one at a time, so a command sees the table
+    exactly as the previous one left it even when it sleeps part way
+    through. Tables each have their own actor and never wait on each
+    other.
+
+    spawn starts a background task and create_queue makes a queue that
+    task can block on, e.g. socketio.start_background_task and
+    socketio.server.eio.create_queue, so this works in any async mode.
+    """
+
+    def __init__(self, code, spawn, create_queue):
+        self.code = code
+        self.create_queue = create_queue
+        self.queue = create_queue()
+        self.task = spawn(self._run)
+
+    def submit(self, command, *args):
+        """Queue command(*args) to run after everything already queued"""
+        self.queue.put((command, args, None))
+
+    def call(self, command, *args):
+        """Queue command(*args), wait for it to run and return its result
+
+        Never call this from a command, the actor would wait on itself.
+        """
+        reply = self.create_queue()
+        self.queue.put((command, args, reply))
+        ok, result = reply.get()
+        if not ok:
+            raise result
+        return result
+
+    def _run(self):
+        while True:
+            command, args, reply = self.queue.get()
+            try:
+                result = command(*args)
+            except Exception as e:
+                # One bad command must not stop the table
+                print(f"Command {command.__name__} failed on table {self.code}")
+                traceback.print_exc()
+                if reply is not None:
+                    reply.put((False, e))
+            else:
+                if reply is not None:
+                    reply.put((True, result))
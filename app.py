@@ -4,14 +4,22 @@ import os
 import time
 from collections import Counter, defaultdict
 from flask_socketio import SocketIO, emit, join_room, leave_room
-from deck import Deck
-from player import Player
-from card import Card
-from texasholdemgame import TexasHoldemGame
+from card import card_dicts
+from table import Table, Seat, PACING
+from betting import in_hand
+from chips import whole_chips
+from engine import ActionError, STREETS, start_hand, act, deal_street, reveal, settle
+from evaluator import hand_category
+from outs import calc_outs
+from equity import calc_equity, EXACT_MAX_TO_COME
+from eventlet import tpool
+from preflop import load_preflop_table, hand_class
+from ranges import range_equity, vpip_range
+from shuffle import make_shuffle_source
+from actor import TableActor
+from timers import TimerWheel
 import math
 from datetime import datetime
-import threading
-from datetime import datetime, timedelta
 
 os.makedirs('static/avatars', exist_ok=True)
 app = Flask(__name__)
@@ -20,8 +28,41 @@ app.secret_key = 'poker-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode="eventlet")
 
 games = {}  # Stores game settings and player data
+actors = {}  # One TableActor per game, the only writer of games[code]
 game_data = {}  # Enhanced tracking for player analysis
-game_timers = {}  # Store timer threads
+game_clocks = {}  # time.time() each game's clock runs out
+timer_wheel = TimerWheel()  # every table's clocks and pauses, fired by run_timers
+table_timers = defaultdict(dict)  # code -> {name: Timer}
+timer_task = None
+preflop_table = load_preflop_table()  # Memory-mapped preflop equities, shared by all games
+# 'system' (CSPRNG), 'pool' (CSPRNG shuffled ahead on a tpool worker) or 'seeded:<seed>' for replays
+shuffle_source = make_shuffle_source(os.environ.get('POKER_SHUFFLE', 'system'))
+# Pacing of new tables unless setup picks one, see table.PACING
+default_pacing = os.environ.get('POKER_PACING', 'normal')
+
+def submit(code, command, *args):
+    """Run command(*args) on the game's actor after what is already queued"""
+    actor = actors.get(code)
+    if actor:
+        actor.submit(command, *args)
+
+def table_command(event):
+    """Register a socket event that runs on the game's actor
+
+    The command gets the sender's sid and the event data. It runs outside
+    the request, so it answers with socketio.emit(..., room=sid).
+    """
+    def register(command):
+        def handler(data):
+            actor = actors.get(data.get('code'))
+            if not actor:
+                emit('error', {'msg': 'Game not found.'})
+                return
+            actor.submit(command, request.sid, data)
+        handler.__name__ = f"on_{command.__name__}"
+        socketio.on(event)(handler)
+        return command
+    return register
 
 @app.route('/')
 def home():
@@ -39,6 +80,7 @@ def make_player_dict():
                     "river": {"actions": [], "bet_amount": 0}
                 },
                 "hole_cards": None,
+                "shuffle": None,  # seed, or commitment and then salt and order, of the deck this hand used
                 "hand_strength": None,
                 "position": None,
                 "result": None,  # 'win', 'lose', 'fold'
@@ -76,7 +118,10 @@ def make_player_dict():
             "average_pot": 0,
             "biggest_pot_won": 0,
             "biggest_pot_lost": 0,
-            "win_rate": 0
+            "win_rate": 0,
+            "preflop_equity": 0,  # Average preflop equity of hands dealt
+            "vpip_preflop_equity": 0,  # Average preflop equity of hands played
+            "vpip_range_equity": 0  # Equity of the hands played against the hands the rest of the table played
         },
         "risk_score": 0,
         "positional_stats": {
@@ -86,40 +131,96 @@ def make_player_dict():
         }
     }
 
+def run_timers():
+    """The one loop that fires the timers of every table"""
+    while True:
+        socketio.sleep(timer_wheel.tick)
+        for timer in timer_wheel.advance():
+            timer.callback(*timer.args)
+
+def schedule(code, name, delay, command, *args):
+    """Run command(*args) on the game's actor in `delay` seconds
+
+    A game has at most one pending timer per name, scheduling it again
+    moves it. No delay skips the wheel, which can only fire a tick later,
+    and queues the command right away.
+    """
+    global timer_task
+    if delay <= 0:
+        cancel(code, name)
+        submit(code, command, *args)
+        return
+    if timer_task is None:
+        timer_task = socketio.start_background_task(run_timers)
+    timer = table_timers[code].get(name)
+    if timer is None:
+        table_timers[code][name] = timer_wheel.schedule(delay, submit, code, command, *args)
+    else:
+        timer.args = (code, command) + args
+        timer_wheel.reschedule(timer, delay)
+
+def cancel(code, name):
+    timer = table_timers[code].get(name)
+    if timer:
+        timer.cancel()
+
 def start_game_timer(code, minutes):
-    """Start a countdown timer for the game"""
-    def timer_thread():
-        end_time = datetime.now() + timedelta(minutes=minutes)
-        
-        while datetime.now() < end_time:
-            if code not in games:  # Game ended
-                return
-                
-            time_left = end_time - datetime.now()
-            minutes_left = int(time_left.total_seconds() // 60)
-            seconds_left = int(time_left.total_seconds() % 60)
-            
-            # Emit time update every second
-            socketio.emit('time_update', {
-                'minutes': minutes_left,
-                'seconds': seconds_left,
-                'total_seconds': int(time_left.total_seconds())
-            }, room=code)
-            
-            time.sleep(1)
-        
-        # Time's up - end the game after current hand
-        if code in games:
-            games[code]['time_expired'] = True
-            socketio.emit('time_expired', {}, room=code)
-            print(f"Time expired for game {code}")
-    
-    thread = threading.Thread(target=timer_thread)
-    thread.daemon = True
-    thread.start()
-    game_timers[code] = thread
+    """Start the game's countdown, replacing any earlier one"""
+    game_clocks[code] = time.time() + minutes * 60
+    schedule(code, 'clock', minutes * 60, clock_expired, code)
+    socketio.emit('clock_sync', clock_state(code), room=code)
     print(f"Started timer for {minutes} minutes for game {code}")
 
+def clock_state(code):
+    """The game's deadline and the server's time now, clients count down from these"""
+    return {'deadline': game_clocks[code], 'server_time': time.time()}
+
+def clock_expired(code):
+    # Time's up - end the game after current hand
+    game = games.get(code)
+    if not game:  # Game ended
+        return
+    game.time_expired = True
+    socketio.emit('time_expired', {}, room=code)
+    print(f"Time expired for game {code}")
+
+def start_turn_clock(code, game):
+    """Give the player to act action_time plus their time bank"""
+    game.turn_deadline = time.time() + game.action_time + game.current_seat().time_bank
+    schedule(code, 'turn', game.turn_deadline - time.time(), turn_expired, code, game.turn_deadline)
+
+def stop_turn_clock(code, game, seat):
+    # The action_time is free, anything past it comes out of the time bank
+    cancel(code, 'turn')
+    if game.turn_deadline is not None:
+        seat.time_bank = max(0, min(seat.time_bank, int(game.turn_deadline - time.time())))
+        game.turn_deadline = None
+
+def turn_state(game):
+    """Who is to act and until when, clients count down from server_time"""
+    seat = game.current_seat()
+    return {
+        'current_player_id': seat.id,
+        'deadline': game.turn_deadline,
+        'server_time': time.time(),
+        'time_bank': seat.time_bank
+    }
+
+def turn_expired(code, deadline):
+    """Check or fold for a player who ran out of time"""
+    game = games.get(code)
+    if not game or game.turn_deadline != deadline or not game.betting_round_active:
+        return  # They acted in time
+    seat = game.current_seat()
+    action = 'check' if seat.current_bet >= game.current_highest_bet else 'fold'
+    print(f"[ACTION] Player {seat.id} ran out of time and will {action.upper()} in game {code}")
+    try:
+        events = act(game, seat.id, action)
+    except ActionError as e:
+        print(f"Could not {action} for {seat.id} in game {code}: {e}")
+        return
+    run_events(code, events)
+
 @app.route('/setup', methods=['GET', 'POST'])
 def setup_game():
     error = None
@@ -136,43 +237,18 @@ def setup_game():
             buy_in = int(request.form['buy_in'])
             big_blind = int(request.form['big_blind'])
             small_blind = int(request.form['small_blind'])
+            action_time = int(request.form.get('action_time') or 30)
+            time_bank = int(request.form.get('time_bank') or 60)
+            pacing = request.form.get('pacing') or default_pacing
+            if pacing not in PACING:
+                error = f"Pacing must be one of {', '.join(PACING)}."
+                return render_template('setup.html', error=error)
             game_code = str(uuid.uuid4())[:6]
-            deck = Deck()
-            community_cards = [deck.deal_card() for i in range(5)]
-            # Set all community cards to hidden initially
-            for card in community_cards:
-                card.visible = False
-                
-            games[game_code] = {
-                'max_players': max_players,
-                'min_players': min_players,
-                'time_limit': time_limit,
-                'chips_per_dollar': chips_per_dollar,
-                'buy_in': buy_in,
-                'big_blind': big_blind,
-                'small_blind': small_blind,
-                'players': [],
-                'current_player_index': 0,
-                'deck': deck,
-                'community_cards': [card.to_dict() for card in community_cards],
-                'current_highest_bet': 0,
-                'last_raiser_index': None,
-                'betting_round_active': True,
-                'round_stage': 'pre-flop',  # pre-flop, flop, turn, river
-                'hand': 1,
-                'pots': [],
-                'active_pot': 0,
-                'dealer_position': 0,  # Track dealer button position
-                'small_blind_pos': 1,  # Small blind is next after dealer
-                'big_blind_pos': 2,    # Big blind is two after dealer
-                'first_hand_completed': False,  # Track if first hand completed
-                'time_expired': False,  # Time limit tracking
-                'extend_votes': set(),     # Votes to extend time
-                'buy_back_votes': set(),    # Votes to buy back in
-                'total_voters': set(),
-                'timer_active': True,
-                "last_player": 0
-            }
+            games[game_code] = Table(game_code, max_players, min_players, time_limit,
+                                     chips_per_dollar, buy_in, big_blind, small_blind,
+                                     action_time, time_bank, pacing)
+            actors[game_code] = TableActor(game_code, socketio.start_background_task,
+                                           socketio.server.eio.create_queue)
             
             # Initialize game_data for this game
             game_data[game_code] = {}
@@ -193,7 +269,7 @@ def join_game(code):
     error = None
     full = False
 
-    if len(game['players']) >= game['max_players']:
+    if len(game.seats) >= game.max_players:
         full = True
         return render_template('player_creation.html', code=code, full=full)
 
@@ -203,6 +279,9 @@ def join_game(code):
 
         if not name:
             error = "Name is required."
+        elif game.seat_by_name(name):
+            # Hand histories and reports are kept per player name
+            error = "That name is already taken at this table."
         else:
             if avatar:
                 avatar_filename = f"{uuid.uuid4().hex}.png"
@@ -212,43 +291,52 @@ def join_game(code):
                 avatar_path = "avatars/default.png"
 
             player_id = str(uuid.uuid4())
-            session['player_id'] = player_id
-            session['game_code'] = code
-            player = Player(name=name, money=float(game['buy_in']), number=len(game['players']) + 1, id=player_id, avatar=avatar_path, ready=False)
-            # Don't deal cards yet - wait for game start
-            game['players'].append(player.to_dict())
-            games[code] = game
-            
-            # Initialize player tracking in game_data
-            if code in game_data:
-                game_data[code][name] = make_player_dict()
-            
-            session['player_id'] = player.id
-            return redirect(url_for('lobby', code=code))
+            error = actors[code].call(seat_player, code, player_id, name, avatar_path)
+            if not error:
+                session['player_id'] = player_id
+                session['game_code'] = code
+                return redirect(url_for('lobby', code=code))
     return render_template('player_creation.html', code=code, error=error, full=full)
 
+def seat_player(code, player_id, name, avatar_path):
+    """Add a player to the table, returns an error message if they can't sit"""
+    game = games[code]
+    if len(game.seats) >= game.max_players:
+        return "Sorry, this table is full."
+    if game.seat_by_name(name):
+        return "That name is already taken at this table."
+    player = Seat(player_id, name, len(game.seats) + 1, 0, avatar=avatar_path)
+    # Don't deal cards yet - wait for game start
+    game.add_seat(player)
+    game.chips.buy_in(player, game.buy_in)
+
+    # Initialize player tracking in game_data
+    if code in game_data:
+        game_data[code][name] = make_player_dict()
+    return None
+
 @app.route('/lobby/<code>')
 def lobby(code):
     game = games.get(code)
     if not game:
         return "Game not found.", 404
 
-    current_players = len(game['players'])
-    min_players = game['min_players']
+    current_players = len(game.seats)
+    min_players = game.min_players
 
     if current_players < min_players:
         players_needed = min_players - current_players
         return render_template(
             'waiting_lobby.html',
             code=code,
-            players=game['players'],
+            players=game.players_view(),
             players_needed=players_needed
         )
     else:
         return render_template(
             'lobby.html',
             code=code,
-            players=game['players']
+            players=game.players_view()
         )
 
 @app.route('/start/<code>', methods=['POST'])
@@ -261,111 +349,31 @@ def start_game(code):
     if not player_id:
         return "Player session not found.", 400
 
-    for player in game['players']:
-        if player['id'] == player_id:
-            player['ready'] = True
-
-    if all(player.get('ready', False) for player in game['players']):
-        # Start the game timer
-        start_game_timer(code, game['time_limit'])
-        
-        # Initialize first hand
-        game['deck'] = Deck()
-        
-        # Deal hole cards to players
-        for player in game['players']:
-            player['holecards'] = []
-            for i in range(2):
-                card = game['deck'].deal_card()
-                card.visible = True
-                player['holecards'].append(card.to_dict())
-                
-            # Initialize hand tracking in game_data
-            if code in game_data and player['name'] in game_data[code]:
-                player_data = game_data[code][player['name']]
-                player_data['hands'][game['hand']]['starting_stack'] = player['money']
-                player_data['hands'][game['hand']]['hole_cards'] = player['holecards']
-                
-                # Determine position
-                player_index = game['players'].index(player)
-                total_players = len(game['players'])
-                if player_index <= 1:
-                    position = "early"
-                elif player_index <= total_players - 3:
-                    position = "middle"
-                else:
-                    position = "late"
-                player_data['hands'][game['hand']]['position'] = position
-                player_data['positional_stats'][position]['hands'] += 1
-
-        # Deal community cards (face down)
-        community_cards = []
-        for i in range(5):
-            card = game['deck'].deal_card()
-            card.visible = False
-            community_cards.append(card.to_dict())
-        game['community_cards'] = community_cards
-        
-        # POST BLINDS 
-        sb_player = game['players'][game['small_blind_pos']]
-        bb_player = game['players'][game['big_blind_pos']]
-        
-        sb_amount = min(game['small_blind'], sb_player['money'])
-        bb_amount = min(game['big_blind'], bb_player['money'])
-        
-        sb_player['money'] -= sb_amount
-        sb_player['current_bet'] = sb_amount
-        bb_player['money'] -= bb_amount
-        bb_player['current_bet'] = bb_amount
-        
-        # Track blind posts in game_data
-        if code in game_data:
-            if sb_player['name'] in game_data[code]:
-                game_data[code][sb_player['name']]['hands'][game['hand']]['investment'] += sb_amount
-            if bb_player['name'] in game_data[code]:
-                game_data[code][bb_player['name']]['hands'][game['hand']]['investment'] += bb_amount
-        
-        # Set initial betting state
-        game['current_highest_bet'] = bb_amount
-        game['last_raiser_index'] = game['big_blind_pos']
-        game['active_pot'] = sb_amount + bb_amount
-        game['current_player_index'] = (game['big_blind_pos'] + 1) % len(game['players'])
-        
-        
-        # Reset player states
-        for player in game['players']:
-            player['has_folded'] = False
-            player['has_gone_all_in'] = False
-            player['moved'] = False
-            player['last_action'] = None
-        
-        print(f"Game {code} started with {len(game['players'])} players")
-        print(f"Dealer: {game['dealer_position']}, SB: {game['small_blind_pos']}, BB: {game['big_blind_pos']}")
-        print(f"Starting player index: {game['current_player_index']}")
-
-        # Emit initial game state with blind information
-        socketio.emit('new_hand_started', {
-            'players': game['players'],
-            'community_cards': game['community_cards'],
-            'current_player_index': game['current_player_index'],
-            'dealer_position': game['dealer_position'],
-            'small_blind_pos': game['small_blind_pos'],
-            'big_blind_pos': game['big_blind_pos'],
-            'current_highest_bet': game['current_highest_bet'],
-            'pot': game['active_pot'],
-            'first_hand_completed': game['first_hand_completed']
-        }, room=code)
-        
-        # Explicitly emit turn update
-        current_player_id = game['players'][game['current_player_index']]['id']
-        socketio.emit('turn_update', {
-            'current_player_id': current_player_id
-        }, room=code)
-        
+    if actors[code].call(player_ready, code, player_id):
         return redirect(url_for('poker_game', code=code))
     else:
         return redirect(url_for('waiting_start', code=code))
 
+def player_ready(code, player_id):
+    """Mark a player ready and deal the first hand once everyone is
+
+    Returns True once the game is running.
+    """
+    game = games[code]
+    player = game.seat(player_id)
+    if player:
+        player.ready = True
+    if not all(player.ready for player in game.seats):
+        return False
+
+    # Start the game timer
+    start_game_timer(code, game.time_limit)
+
+    # Deal the first hand, the button stays where the table put it
+    run_events(code, start_hand(game, shuffle_source, first=True))
+    print(f"Game {code} started with {len(game.seats)} players")
+    return True
+
 @app.route('/waiting_start/<code>')
 def waiting_start(code):
     game = games.get(code)
@@ -376,7 +384,7 @@ def waiting_start(code):
     if not player_id:
         return "Player session not found.", 400
 
-    all_ready = all(player.get('ready', False) for player in game['players'])
+    all_ready = all(player.ready for player in game.seats)
 
     if all_ready:
         return redirect(url_for('poker_game', code=code))
@@ -393,33 +401,21 @@ def poker_game(code):
         return "Player session not found.", 400
 
     # Prepare players data with holecards visibility according to viewer
-    players_data = []
-    for p in game['players']:
-        player = Player.from_dict(p)
-        # Make cards visible only if this is the session player viewing
-        if p['id'] == player_id:
-            # Show actual hole cards (face up)
-            for card in player.holecards:
-                card.visible = True
-        else:
-            # Other players: hide hole cards (show back)
-            for card in player.holecards:
-                card.visible = False
-        players_data.append(player.to_dict())
+    players_data = game.players_view(viewer_id=player_id)
 
     return render_template("poker_game.html",
                        game=game,  
                        players=players_data,
-                       current_player_id=game['players'][game['current_player_index']]['id'],
+                       current_player_id=game.current_seat().id,
                        session_player_id=player_id,
                        code=code,
-                       community_cards=game['community_cards'],
-                       round_stage=game['round_stage'],
-                       current_player_index=game['current_player_index'],
-                       dealer_position=game['dealer_position'],
-                       small_blind_pos=game['small_blind_pos'],
-                       big_blind_pos=game['big_blind_pos'],
-                       first_hand_completed=game['first_hand_completed'])
+                       community_cards=game.board_view(),
+                       round_stage=game.round_stage,
+                       current_player_index=game.current_player_index,
+                       dealer_position=game.dealer_position,
+                       small_blind_pos=game.small_blind_pos,
+                       big_blind_pos=game.big_blind_pos,
+                       first_hand_completed=game.first_hand_completed)
 
 # Game over routes
 @app.route('/game_over_time/<code>')
@@ -452,22 +448,25 @@ def continue_game(code):
     if not game:
         return "Game not found.", 404
     
+    submit(code, continue_after_time, code)
+    return redirect(url_for('poker_game', code=code))
+
+def continue_after_time(code):
+    game = games[code]
+
     # Reset game state for continuation
-    game['time_expired'] = False
+    game.time_expired = False
     
     # Reset vote counts using the new set format
-    game['extend_votes'] = set()
-    game['total_voters'] = set()
+    game.extend_votes = set()
+    game.total_voters = set()
     
     # Start new timer with extended time
-    extended_time = game['time_limit'] // 2
+    extended_time = game.time_limit // 2
     start_game_timer(code, extended_time)
     
-    # Instead of just redirecting, we need to continue the game properly
     # Start a new hand to continue playing
-    socketio.start_background_task(start_new_hand, code)
-    
-    return redirect(url_for('poker_game', code=code))
+    start_new_hand(code)
 
 ### SOCKET.IO EVENTS ###
 
@@ -483,150 +482,227 @@ def handle_disconnect():
 def on_join_room(data):
     room = data['code']
     join_room(room)
+    # Each player also gets a private room for events only they should see
+    player_id = session.get('player_id')
+    if player_id:
+        join_room(player_id)
     print(f"Client {request.sid} joined room {room}")
     
     # Send current game state to the joining client
     game = games.get(room)
     if game:
-        emit('turn_update', {
-            'current_player_id': game['players'][game['current_player_index']]['id']
-        }, room=request.sid)
+        emit('turn_update', turn_state(game), room=request.sid)
         
         # Send current stage
         emit('update_stage', {
-            'stage': game['round_stage'],
+            'stage': game.round_stage,
             'temp_status': None
         }, room=request.sid)
         
+        # Re-send this player's outs, cached since the street was dealt
+        player = game.seat(player_id)
+        if player and game.round_stage in ('flop', 'turn') and in_hand(player):
+            emit('outs_update', get_player_outs(game, player), room=request.sid)
+        
         # Send current timer state if available
-        if room in game_timers:
-            # Calculate time left (this is approximate)
-            time_left = game['time_limit'] * 60  # Convert to seconds
-            minutes = time_left // 60
-            seconds = time_left % 60
-            emit('time_update', {
-                'minutes': minutes,
-                'seconds': seconds,
-                'total_seconds': time_left
-            }, room=request.sid)
+        if room in game_clocks:
+            emit('clock_sync', clock_state(room), room=request.sid)
 
-def next_round_stage(code):
+def get_player_outs(game, player):
+    """Outs and draw odds for one player, using only what they can see"""
+    board = game.community_cards[:game.board_shown]
+    category, outs, probability = calc_outs(player.holecards, board)
+    return {
+        'stage': game.round_stage,
+        'hand_category': category,
+        'outs': card_dicts(outs, visible=True),
+        'improve_probability': probability
+    }
+
+def send_outs(code):
+    """Send every live player their own outs for the street just dealt"""
     game = games.get(code)
     if not game:
         return
-    
-    # Convert community cards to Card objects
-    community_cards = [Card.from_dict(card) for card in game['community_cards']]
-    
-    # Stages in order
-    stages = ['pre-flop', 'flop', 'turn', 'river']
-    current_index = stages.index(game['round_stage'])
-    
-    if current_index < len(stages) - 1:
-        next_stage = stages[current_index + 1]
-        temp_status = f"Betting round over - dealing the {next_stage}"
-        
-        socketio.emit('update_stage', {
-            'stage': game['round_stage'],
-            'temp_status': temp_status
-        }, room=code)
-        
-        socketio.sleep(2)
-        
-        # Advance to next stage
-        game['round_stage'] = next_stage
-        
-        # Update community card visibility
-        if next_stage == 'flop':
-            for i in range(3):
-                community_cards[i].visible = True
-        elif next_stage == 'turn':
-            community_cards[3].visible = True
-        elif next_stage == 'river':
-            community_cards[4].visible = True
-            
-        game['community_cards'] = [card.to_dict() for card in community_cards]
-        
-        # Emit updated community cards
-        socketio.emit('update_community_cards', {
-            'community_cards': game['community_cards']
-        }, room=code)
-            
-        # Reset betting state
-        game['last_raiser_index'] = None
-        for player in game['players']:
-            player['moved'] = False
-        
-        # Set starting player for this street
-        if next_stage == 'flop':
-            # Post-flop streets start with player after dealer
-            game['current_player_index'] = (game['dealer_position'] + 1) % len(game['players'])
+    for player in game.seats:
+        if in_hand(player):
+            socketio.emit('outs_update', get_player_outs(game, player), room=player.id)
+
+def run_events(code, events):
+    """Send what the engine did to the room, then schedule its next step"""
+    game = games.get(code)
+    if not game:
+        return
+    pause = 0
+    for kind, data in events:
+        if kind == 'hand_started':
+            record_hand_start(code, data['blinds'])
+            print(f"Dealer: {game.dealer_position}, SB: {game.small_blind_pos}, BB: {game.big_blind_pos}")
+            socketio.emit('new_hand_started', {
+                'players': game.players_view(show_cards=True),
+                'community_cards': game.board_view(),
+                'current_player_index': game.current_player_index,
+                'dealer_position': game.dealer_position,
+                'small_blind_pos': game.small_blind_pos,
+                'big_blind_pos': game.big_blind_pos,
+                'current_highest_bet': game.current_highest_bet,
+                'pot': game.active_pot,
+                'first_hand_completed': game.first_hand_completed
+            }, room=code)
+        elif kind == 'action':
+            stop_turn_clock(code, game, game.seat(data['player_id']))
+            record_action(code, data)
+            socketio.emit('update_action', {
+                'player_id': data['player_id'],
+                'action_text': data['text'],
+                'money': data['money'],
+                'pot': data['pot']
+            }, room=code)
+        elif kind == 'street':
+            socketio.emit('update_community_cards', {
+                'community_cards': game.board_view()
+            }, room=code)
+            if data['stage'] == 'showdown':
+                socketio.emit('update_stage', {
+                    'stage': 'showdown',
+                    'temp_status': 'Showdown! All cards revealed'
+                }, room=code)
+                pause = game.pacing['street']
+            else:
+                # Privately send each player the cards that improve their hand
+                if data['stage'] in ('flop', 'turn'):
+                    send_outs(code)
+                socketio.emit('update_stage', {
+                    'stage': data['stage'],
+                    'temp_status': None
+                }, room=code)
+        elif kind == 'turn':
+            start_turn_clock(code, game)
+            socketio.emit('turn_update', turn_state(game), room=code)
+        elif kind == 'street_over':
+            if data['stage'] == 'river':
+                # Straight to the showdown, no timer involved
+                cancel(code, 'step')
+                submit(code, next_round_stage, code)
+            else:
+                next_stage = STREETS[STREETS.index(data['stage']) + 1]
+                socketio.emit('update_stage', {
+                    'stage': data['stage'],
+                    'temp_status': f"Betting round over - dealing the {next_stage}"
+                }, room=code)
+                schedule(code, 'step', game.pacing['street'], next_round_stage, code)
+        elif kind == 'runout':
+            submit(code, all_in_showdown, code, data['hands'], data['board'])
+        elif kind == 'showdown':
+            schedule(code, 'step', pause, process_showdown, code)
+        elif kind == 'game_over':
+            winner = game.seat(data['winner_id'])
+            if winner:
+                print(f"Game over - only one player with chips: {winner.name}")
+                socketio.emit('game_over', {
+                    'winner_id': winner.id,
+                    'winner_name': winner.name
+                }, room=code)
+
+            # Generate final reports
+            reports = generate_player_reports(code)
+            socketio.emit('game_analysis_report', {
+                'reports': reports
+            }, room=code)
+
+def record_shuffle(code, shuffle):
+    """Put the finished hand's shuffle record, salt and order included, in everyone's history"""
+    game = games.get(code)
+    if code not in game_data:
+        return
+    for player in game.seats:
+        if player.name in game_data[code] and player.holecards:
+            game_data[code][player.name]['hands'][game.hand]['shuffle'] = shuffle
+
+def record_hand_start(code, blinds):
+    """Track stacks, hole cards, position and blinds of everyone dealt in"""
+    game = games.get(code)
+    if code not in game_data:
+        return
+    for player in game.seats:
+        if player.name not in game_data[code] or not player.holecards:
+            continue
+        player_data = game_data[code][player.name]
+        current_hand = player_data['hands'][game.hand]
+        current_hand['starting_stack'] = player.money + blinds.get(player.id, 0)
+        current_hand['hole_cards'] = player.holecards
+        current_hand['shuffle'] = game.shuffle
+        current_hand['investment'] += blinds.get(player.id, 0)
+        player_data['stats']['hands_played'] += 1
+
+        # Determine position
+        player_index = game.seat_index[player.id]
+        total_players = len(game.seats)
+        if player_index <= 1:
+            position = "early"
+        elif player_index <= total_players - 3:
+            position = "middle"
         else:
-            # For turn and river, just continue from previous position
-            game['current_player_index'] = game['current_player_index']
-        
-        # Skip folded/all-in players
-        while True:
-            current_player = game['players'][game['current_player_index']]
-            if (not current_player.get('has_folded') and 
-                not current_player.get('has_gone_all_in') and
-                current_player['money'] > 0):  # Check if player has money
-                break
-            game['current_player_index'] = (game['current_player_index'] + 1) % len(game['players'])
-        
-        game['betting_round_active'] = True
-        
-        # Send updates
-        socketio.emit('update_stage', {
-            'stage': game['round_stage'],
-            'temp_status': None
-        }, room=code)
-        
-        socketio.emit('turn_update', {
-            'current_player_id': game['players'][game['current_player_index']]['id'],
-            'dealer_position': game['dealer_position'],
-            'small_blind_pos': game['small_blind_pos'],
-            'big_blind_pos': game['big_blind_pos']
-        }, room=code)
-    else:
-        # Showdown - reveal all community cards
-        community_cards = [Card.from_dict(card) for card in game['community_cards']]
-        for card in community_cards:
-            card.visible = True
-        game['community_cards'] = [card.to_dict() for card in community_cards]
-        
-        socketio.emit('update_community_cards', {
-            'community_cards': game['community_cards']
-        }, room=code)
-        socketio.emit('update_stage', {
-            'stage': 'showdown',
-            'temp_status': 'Showdown! All cards revealed'
-        }, room=code)
-        
-        socketio.sleep(2)
-        
-        # Process showdown in background
-        socketio.start_background_task(process_showdown, code)
+            position = "late"
+        current_hand['position'] = position
+        player_data['positional_stats'][position]['hands'] += 1
+
+def record_action(code, data):
+    """Track one action in the acting player's hand history and stats"""
+    game = games.get(code)
+    player = game.seat(data['player_id'])
+    if code not in game_data or player.name not in game_data[code]:
+        return
+    player_data = game_data[code][player.name]
+    current_hand = player_data['hands'][game.hand]
+    current_round = current_hand['betting_rounds'][data['stage']]
+    action = data['action']
+    current_round['actions'].append({
+        'action': action,
+        'amount': data['chips'],
+        'timestamp': time.time(),
+        'pot_size': data['pot'] - data['chips'],
+        'current_bet': data['highest_bet']
+    })
+    current_hand['investment'] += data['chips']
+
+    # Update statistics
+    stats = player_data['stats']
+    if action == 'fold':
+        stats['total_folds'] += 1
+    elif action == 'check':
+        stats['total_checks'] += 1
+    elif action == 'call':
+        stats['total_calls'] += 1
+    elif action == 'raise':
+        stats['total_raises'] += 1
+        stats['total_bets'] += 1
+        # Check for pre-flop raise
+        if data['stage'] == 'pre-flop':
+            stats['preflop_raise'] += 1
+
+def next_round_stage(code):
+    game = games.get(code)
+    if not game:
+        return
+    run_events(code, deal_street(game))
 
 def process_showdown(code):
     """Process showdown in a background task"""
     game = games.get(code)
     if not game:
         return
-        
-    # Make all hole cards visible during showdown
-    for player in game['players']:
-        for card in player['holecards']:
-            card['visible'] = True
-        # Calculate and attach hand description for display (mark folded players)
-        if player.get('has_folded'):
-            player['hand_description'] = 'Folded'
-        else:
-            get_hand(code, player)
-    
-    # Emit showdown cards FIRST to reveal everything
+
+    # Every live hand is scored once here and settled from that score
+    for kind, data in reveal(game):
+        for player_id, score in data['scores'].items():
+            player = game.seat(player_id)
+            if code in game_data and player.name in game_data[code]:
+                game_data[code][player.name]['hands'][game.hand]['hand_strength'] = hand_category(score)
+
+    # Emit showdown cards FIRST to reveal everything, all hole cards face up
     socketio.emit('showdown_cards', {
-        'players': game['players']
+        'players': game.players_view(show_cards=True)
     }, room=code)
     
     socketio.emit('update_stage', {
@@ -634,102 +710,75 @@ def process_showdown(code):
         'temp_status': 'Showdown! All cards revealed'
     }, room=code)
     
-    # Wait 5 seconds for players to see all cards
-    socketio.sleep(5)
-    
-    # Now process the pots and winners
-    create_pots(code)
+    # Pay the pots and update the analytics now, while players look at the
+    # cards, so the results and the next hand are ready when the hold ends
     winners_info = []
     winner_ids = set()
-    
-    # Process each pot
-    for pot in game['pots']:
-        pot_players = [p for p in game['players'] if p['id'] in pot['players'] and not p['has_folded']]
-        
-        # Calculate hand scores for all players in this pot
-        for player in pot_players:
-            if player["has_folded"]:
-                continue
-            get_hand(code, player)
-        
-        # Find winners for this pot
-        winners = []
-        winnerhand = []
-        winnerscore = -1
-        
-        for player in pot_players:
-            if player['handscores'][0] > winnerscore:
-                winners = [player]
-                winnerhand = player['handscores']
-                winnerscore = player['handscores'][0]
-            elif player['handscores'][0] == winnerscore:    
-                # Tie-breaker: compare kickers
-                for i in range(len(winnerhand)):
-                    if player['handscores'][i] > winnerhand[i]:
-                        winners = [player]
-                        winnerhand = player['handscores']
-                        winnerscore = player['handscores'][0]
-                        break
-                    elif player['handscores'][i] < winnerhand[i]:
-                        break
-                else:
-                    # Complete tie
-                    winners.append(player)
-        
-        print(f"Pot winners: {', '.join((player['name'] for player in winners))}")
-
-        # Split pot among winners
-        pot_per_winner = pot["amount"] / len(winners)
-        
-        for winner in winners:
-            winner['money'] += pot_per_winner
-            winners_info.append({
-                'player_id': winner['id'],
-                'amount': pot_per_winner,
-                'pot_index': game['pots'].index(pot)
-            })
-            winner_ids.add(winner['id'])
-            
-            # Update game_data for winners
-            if code in game_data and winner['name'] in game_data[code]:
-                player_data = game_data[code][winner['name']]
-                current_hand = player_data['hands'][game['hand']]
-                current_hand['result'] = 'win'
-                current_hand['pot_won'] += pot_per_winner
-                current_hand['ending_stack'] = winner['money']
-                player_data['total_profit'] += pot_per_winner - current_hand['investment']
-                player_data['stats']['hands_won'] += 1
-                player_data['stats']['biggest_pot_won'] = max(player_data['stats']['biggest_pot_won'], pot_per_winner)
+    for kind, award in settle(game):
+        if kind == 'hand_complete':
+            record_shuffle(code, award['shuffle'])
+        if kind != 'pot_awarded':
+            continue
+        winner = game.seat(award['player'])
+        amount = award['amount']
+        print(f"Pot {award['pot_index']} winner: {winner.name} ({amount})")
+        winners_info.append({
+            'player_id': winner.id,
+            'amount': amount,
+            'pot_index': award['pot_index']
+        })
+        winner_ids.add(winner.id)
+        
+        # Update game_data for winners
+        if code in game_data and winner.name in game_data[code]:
+            player_data = game_data[code][winner.name]
+            current_hand = player_data['hands'][game.hand]
+            current_hand['result'] = 'win'
+            current_hand['pot_won'] += amount
+            current_hand['ending_stack'] = winner.money
+            player_data['total_profit'] += amount - current_hand['investment']
+            player_data['stats']['hands_won'] += 1
+            player_data['stats']['biggest_pot_won'] = max(player_data['stats']['biggest_pot_won'], amount)
 
     # Update game_data for losers
-    for player in game['players']:
-        if player['id'] not in winner_ids:
-            if code in game_data and player['name'] in game_data[code]:
-                player_data = game_data[code][player['name']]
-                current_hand = player_data['hands'][game['hand']]
-                if not player['has_folded']:
+    for player in game.seats:
+        if player.id not in winner_ids:
+            if code in game_data and player.name in game_data[code]:
+                player_data = game_data[code][player.name]
+                current_hand = player_data['hands'][game.hand]
+                if not player.has_folded:
                     current_hand['result'] = 'lose'
-                current_hand['ending_stack'] = player['money']
+                current_hand['ending_stack'] = player.money
                 loss_amount = current_hand['investment']
                 player_data['total_profit'] -= loss_amount
                 player_data['stats']['biggest_pot_lost'] = max(player_data['stats']['biggest_pot_lost'], loss_amount)
 
-    # Mark first hand as completed
-    game['first_hand_completed'] = True
+    schedule(code, 'step', game.pacing['reveal'], show_results, code, winners_info)
 
-    # Emit winner information after showing cards for 5 seconds
+def show_results(code, winners_info):
+    """Emit the winners once the cards have been shown for the reveal hold"""
+    game = games.get(code)
+    if not game:
+        return
+    hold = game.pacing['results']
     socketio.emit('showdown_results', {
-        'winners': winners_info
+        'winners': winners_info,
+        'hold': hold,
+        'animation': game.pacing['animation']
     }, room=code)
     
-    # Calculate and emit player reports if game is ending
-    players_with_chips = [p for p in game['players'] if p['money'] > 0 and not p.get('sit_out_next_hand', False)]
-    
-    # Wait for winner animation to complete (5 seconds)
-    socketio.sleep(5)
+    # Wait for winner animation to complete
+    schedule(code, 'step', hold, finish_hand, code)
+
+def finish_hand(code):
+    """End the game or deal the next hand once the results have been shown"""
+    game = games.get(code)
+    if not game:
+        return
+    players_with_chips = [p for p in game.seats if p.money > 0 and not p.sit_out_next_hand]
 
     # Check for time expiration
-    if game.get('time_expired'):
+    if game.time_expired:
         socketio.emit('game_over_time', {}, room=code)
         return
     
@@ -740,196 +789,39 @@ def process_showdown(code):
     # Start new betting round
     start_new_hand(code)
 
-def get_hand(code, p):
-    game = games.get(code)
-    if not game:
-        return
-    p['handscores'] = calc_hand(game['community_cards'], p['holecards'])
-    # Add hand description for display
-    p['hand_description'] = get_hand_description(p['handscores'])
-    
-    # Update game_data with hand strength
-    if code in game_data and p['name'] in game_data[code]:
-        game_data[code][p['name']]['hands'][game['hand']]['hand_strength'] = p['handscores'][0]
-
-def get_hand_description(hand_score):
-    """Convert hand score to human readable description"""
-    if not hand_score:
-        return "No hand"
-    
-    hand_rank = hand_score[0]
-    descriptions = {
-        10: "Royal Flush",
-        9: "Straight Flush",
-        8: "Four of a Kind", 
-        7: "Full House",
-        6: "Flush",
-        5: "Straight",
-        4: "Three of a Kind",
-        3: "Two Pair",
-        2: "One Pair",
-        1: "High Card"
-    }
-    return descriptions.get(hand_rank, "Unknown Hand")
-
-def calc_hand(community_cards, hole_cards):
-        com_cards = [Card.from_dict(card) for card in community_cards]
-        h_cards = [Card.from_dict(card) for card in hole_cards]
-        return_list = []
-        s = False
-        hc = True
-        all_cards = com_cards + h_cards
-        all_cards.sort(key=lambda card: card.rank)
-        rank_counts = Counter(card.rank for card in all_cards)
-        suit_counts = Counter(card.suit for card in all_cards)
-        fk = 4 in rank_counts.values()
-        fh = 3 in rank_counts.values() and 2 in rank_counts.values()
-        f = any(count >= 5 for count in suit_counts.values())
-        flush_suit = next((suit for suit, count in suit_counts.items() if count >= 5), None)
-        tk = 3 in rank_counts.values()
-        tp = list(rank_counts.values()).count(2) >= 2
-        p = 2 in rank_counts.values()
-        suits = {}
-        royal_ranks = {10, 11, 12, 13, 14}
-        for card in all_cards:
-            suits.setdefault(card.suit, []).append(card)
-        rf = False
-        for suited_cards in suits.values():
-            suited_ranks = set(card.rank for card in suited_cards)
-            if royal_ranks.issubset(suited_ranks):
-                rf = True
-                break
-        count = 1
-        duplicates = 0
-        sf = False
-        for i in range(len(all_cards)-1, 0, -1):
-            if count == 5:
-                s = True
-                sstart = i
-                break
-            if all_cards[i-1].rank - all_cards[i].rank == -1:
-                count += 1
-            else:
-                if all_cards[i-1].rank - all_cards[i].rank != 0:
-                    count = 1
-                else:
-                    duplicates += 1
-        if s:
-            flush_count = Counter(card.suit for card in all_cards[sstart:sstart + 5 + duplicates])
-            if 5 in flush_count.values():
-                sf = True
-        
-        if rf:
-            return_list.append(10)
-            return_list.append(10+11+12+13+14)
-            return_list.append(0)
-            return return_list
-        elif sf:
-            return_list.append(9)
-            return_list.append(all_cards[sstart + 4].rank)
-            return return_list
-        elif fk:
-            return_list.append(8)
-            fk_rank = next((rank for rank, count in rank_counts.items() if count == 4), None)
-            kicker = max(card.rank for card in all_cards if card.rank != fk_rank)
-            return_list.append(fk_rank)
-            return_list.append(kicker)
-            return return_list
-        elif fh:
-            return_list.append(7)
-            return_list.append(next((rank for rank, count in rank_counts.items() if count == 3), None))
-            return_list.append(max((rank for rank, count in rank_counts.items() if count == 2), default=None))
-            return return_list
-        elif f:
-            return_list.append(6)
-            flush_cards = [card for card in all_cards if card.suit == flush_suit]
-            flush_cards_sorted = sorted(flush_cards, key=lambda c: c.rank, reverse=True)
-            return_list.append(flush_cards_sorted[0].rank)
-            return_list.append(flush_cards_sorted[1].rank)
-            return_list.append(flush_cards_sorted[2].rank)
-            return_list.append(flush_cards_sorted[3].rank)
-            return_list.append(flush_cards_sorted[4].rank)
-            return return_list
-        elif s:
-            return_list.append(5)
-            return_list.append(all_cards[sstart + 4].rank)
-            return return_list
-        elif tk:
-            return_list.append(4)
-            trip_rank = max((rank for rank, count in rank_counts.items() if count == 3), default=None)
-            return_list.append(trip_rank)
-            kickers = [card.rank for card in all_cards if card.rank != trip_rank]
-            kickers = sorted(set(kickers), reverse=True)[:2]
-            return_list.extend(kickers)
-            return return_list
-        elif tp:
-            pairs = sorted((rank for rank, count in rank_counts.items() if count == 2), reverse=True)
-            pair_rank1, pair_rank2 = pairs[:2]
-            kicker = max(card.rank for card in all_cards if card.rank != pair_rank1 and card.rank != pair_rank2)
-            return_list.append(3)
-            return_list.append(pair_rank1)
-            return_list.append(pair_rank2)
-            return_list.append(kicker)
-            return return_list
-        elif p:
-            return_list.append(2)
-            pair_rank = max((rank for rank, count in rank_counts.items() if count == 2), default=None)
-            return_list.append(pair_rank)
-            kickers = [card.rank for card in all_cards if card.rank != pair_rank]
-            kickers = sorted(set(kickers), reverse=True)[:3]
-            return_list.extend(kickers)
-            return return_list
-        elif hc:
-            return_list.append(1)
-            return_list.append(all_cards[-1].rank)
-            return_list.append(all_cards[-2].rank)
-            return_list.append(all_cards[-3].rank)
-            return_list.append(all_cards[-4].rank)
-            return_list.append(all_cards[-5].rank)
-            return return_list
-    
-        
-def create_pots(code):
+def calc_all_in_equity(hands, visible_board):
+    """Win/tie equity per player id from hole cards and the board seen at the all-in"""
+    player_ids = list(hands)
+    result = calc_equity([hands[pid] for pid in player_ids], visible_board)
+    return [dict(player_id=pid, **numbers) for pid, numbers in zip(player_ids, result['players'])]
+
+def all_in_showdown(code, hands, visible_board):
+    """Broadcast all-in equity, then turn over the board and run the showdown"""
     game = games.get(code)
     if not game:
         return
-    game['pots'] = []  # reset pots list
-
-    # Get all players who still have money in the pot and are eligible
-    active_players = [p for p in game['players'] if p['current_bet'] > 0 and not p.get('has_folded', False)]
-    if not active_players:
-        return
-
-    # Sort players by their current bet (ascending)
-    active_players.sort(key=lambda p: p['current_bet'])
-    
-    previous_bet = 0
-    for i, player in enumerate(active_players):
-        current_bet = player['current_bet']
-        if current_bet <= previous_bet:
-            continue
-            
-        # Calculate how much each player contributes to this side pot
-        pot_amount = 0
-        pot_players = []
-        
-        for p in game['players']:
-            if p['current_bet'] >= current_bet and not p.get('has_folded', False):
-                contribution = min(current_bet - previous_bet, p['current_bet'] - previous_bet)
-                pot_amount += contribution
-                pot_players.append(p['id'])
-        
-        if pot_amount > 0:
-            game['pots'].append({
-                "amount": pot_amount,
-                "players": pot_players  # players eligible for this pot
-            })
-        
-        previous_bet = current_bet
+    if len(hands) < 2:
+        # Nobody left to race against (players not dealt in hold no cards)
+        equity = []
+    elif 5 - len(visible_board) <= EXACT_MAX_TO_COME:
+        # Exact enumeration from the flop on takes a few milliseconds
+        equity = calc_all_in_equity(hands, visible_board)
+    else:
+        # Preflop sampling is CPU bound, run it on a native thread so the
+        # eventlet loop keeps serving other tables
+        equity = tpool.execute(calc_all_in_equity, hands, visible_board)
+    socketio.emit('update_stage', {
+        'stage': 'showdown',
+        'temp_status': 'No further betting possible - proceeding to showdown',
+        'equity': equity
+    }, room=code)
 
-    # After creating pots, reset all current_bets to 0 for next hand
-    for player in game['players']:
-        player['current_bet'] = 0
+    # Reveal all community cards before showdown, only once the equity
+    # for the board the players saw is out
+    socketio.emit('update_community_cards', {
+        'community_cards': game.board_view()
+    }, room=code)
+    process_showdown(code)
 
 def start_new_hand(code):
     game = games.get(code)
@@ -937,527 +829,201 @@ def start_new_hand(code):
         return
 
     print(f"Starting new hand for game {code}")
-    game['hand'] += 1
-
-    # Reset all current bets
-    for player in game['players']:
-        player['current_bet'] = 0
-
-    # Reset deck before any cards are dealt
-    game['deck'] = Deck()
-
-    # In start_new_hand function, before dealing cards:
-    for player in game['players']:
-        # Check if player has bought back in and should get money
-        if player.get('buy_back_amount'):
-            player['money'] = player['buy_back_amount']
-            player['buy_back_amount'] = None  # Clear the buy back amount
-            player['sit_out_next_hand'] = False
-        
-        if (player['money'] > 0 and 
-            not player.get('is_out', False) and 
-            not player.get('sit_out_next_hand', False)):
-            # Deal new hole cards
-            player['holecards'] = []
-            for i in range(2):
-                card = game['deck'].deal_card()
-                card.visible = True
-                player['holecards'].append(card.to_dict())
-        
-            # Reset player status
-            player['has_folded'] = False
-            player['has_gone_all_in'] = False
-            player['moved'] = False
-            player['last_action'] = None
-            player['hand_description'] = None
-            player['sitting_out'] = False
-        
-            # Update game_data for new hand
-            if code in game_data and player['name'] in game_data[code]:
-                player_data = game_data[code][player['name']]
-                player_data['hands'][game['hand']]['starting_stack'] = player['money']
-                player_data['hands'][game['hand']]['hole_cards'] = player['holecards']
-                player_data['stats']['hands_played'] += 1
-            
-                # Determine position
-                player_index = game['players'].index(player)
-                total_players = len(game['players'])
-                if player_index <= 1:
-                    position = "early"
-                elif player_index <= total_players - 3:
-                    position = "middle"
-                else:
-                    position = "late"
-
-                player_data['hands'][game['hand']]['position'] = position
-                player_data['positional_stats'][position]['hands'] += 1
-        else:
-            # If player chose to sit out next hand, mark them as sitting out for this hand
-            if player.get('sit_out_next_hand', False):
-                player['sitting_out'] = True
-                player['is_out'] = False  # Ensure they're not marked as out
-    # Check for game over conditions
-    players_with_chips = [p for p in game['players'] if p['money'] > 0 and not p.get('sit_out_next_hand', False)]
-    if len(players_with_chips) == 1:
-        print(f"Game over - only one player with chips: {players_with_chips[0]['name']}")
-        winner = players_with_chips[0]
-        socketio.emit('game_over', {
-            'winner_id': winner['id'],
-            'winner_name': winner['name']
-        }, room=code)
-        
-        # Generate final reports
-        reports = generate_player_reports(code)
-        socketio.emit('game_analysis_report', {
-            'reports': reports
-        }, room=code)
-        return
-    # Move dealer button to next ACTIVE player (excluding sitting out players)
-    def find_next_active(start_idx):
-        idx = start_idx % len(game['players'])
-        checked = 0
-        while checked < len(game['players']):
-            player = game['players'][idx]
-            if not player.get('is_out', False) and player['money'] > 0 and not player.get('sit_out_next_hand', False):
-                return idx
-            idx = (idx + 1) % len(game['players'])
-            checked += 1
-        return start_idx  # fallback
-
-    # Advance dealer position once
-    game['dealer_position'] = find_next_active(game['dealer_position'] + 1)
-    
-    # Set blind positions relative to dealer (excluding sitting out players)
-    game['small_blind_pos'] = find_next_active(game['dealer_position'] + 1)
-    game['big_blind_pos'] = find_next_active(game['small_blind_pos'] + 1)
-
-    print(f"Dealer: {game['dealer_position']}, SB: {game['small_blind_pos']}, BB: {game['big_blind_pos']}")
-
-    # Post blinds (only for non-sitting out players)
-    sb_player = game['players'][game['small_blind_pos']]
-    bb_player = game['players'][game['big_blind_pos']]
-    
-    sb_amount = min(game['small_blind'], sb_player['money'])
-    bb_amount = min(game['big_blind'], bb_player['money'])
-    
-    sb_player['money'] -= sb_amount
-    sb_player['current_bet'] = sb_amount
-    bb_player['money'] -= bb_amount
-    bb_player['current_bet'] = bb_amount
-    
-    # Set initial pot
-    game['active_pot'] = sb_amount + bb_amount
-    
-    # Reset community cards (face down)
-    community_cards = []
-    for i in range(5):
-        card = game['deck'].deal_card()
-        card.visible = False
-        community_cards.append(card.to_dict())
-    game['community_cards'] = community_cards
-
-    # Set starting player (after big blind) - excluding sitting out players
-    game['current_player_index'] = find_next_active(game['big_blind_pos'] + 1)
-    
-    # Reset betting state
-    game['current_highest_bet'] = bb_amount
-    game['last_raiser_index'] = game['big_blind_pos']
-    game['betting_round_active'] = True
-    game['round_stage'] = 'pre-flop'
-    game['pots'] = []
-
-    print(f"Starting player index: {game['current_player_index']}")
-
-    # Emit game state
-    socketio.emit('new_hand_started', {
-        'players': game['players'],
-        'community_cards': game['community_cards'],
-        'current_player_index': game['current_player_index'],
-        'dealer_position': game['dealer_position'],
-        'small_blind_pos': game['small_blind_pos'],
-        'big_blind_pos': game['big_blind_pos'],
-        'current_highest_bet': game['current_highest_bet'],
-        'pot': game['active_pot'],
-        'first_hand_completed': game['first_hand_completed']
-    }, room=code)
-    
-    # Start betting
-    socketio.emit('turn_update', {
-        'current_player_id': game['players'][game['current_player_index']]['id']
-    }, room=code)
+    run_events(code, start_hand(game, shuffle_source))
 
 
-@socketio.on('player_action')
-def handle_player_action(data):
+@table_command('player_action')
+def handle_player_action(sid, data):
     code = data['code']
     player_id = data['player_id']
     action = data['action']
-    amount = data.get('amount', 0)
+    try:
+        amount = whole_chips(data.get('amount') or 0)
+    except ValueError as e:
+        socketio.emit('error', {'msg': str(e)}, room=sid)
+        return
     print(f"[ACTION] Player {player_id} does {action.upper()} with amount {amount} in game {code}")
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
-        return
-        
-    if not game.get('betting_round_active'):
-        emit('error', {'msg': 'Betting round not active'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
 
-    player = next((p for p in game['players'] if p['id'] == player_id), None)
-    if not player:
-        emit('error', {'msg': 'Player not found.'})
+    try:
+        events = act(game, player_id, action, amount)
+    except ActionError as e:
+        socketio.emit('error', {'msg': str(e)}, room=sid)
         return
+    run_events(code, events)
 
-    # Check if player is all-in or has no money
-    if player.get('has_gone_all_in') or player['money'] <= 0:
-        emit('error', {'msg': 'You are all-in and cannot act.'})
-        return
-    # In handle_player_action function, add sitting_out check
-    if player.get('sitting_out', False):
-        emit('error', {'msg': 'You are sitting out this hand.'})
-        return
-
-    current_index = game['current_player_index']
-    current_player = game['players'][current_index]
 
-    if player['id'] != current_player['id']:
-        emit('error', {'msg': 'Not your turn!'})
-        return
-    # Update game_data with player action
-    if code in game_data and player['name'] in game_data[code]:
-        player_data = game_data[code][player['name']]
-        current_hand = player_data['hands'][game['hand']]
-        current_round = current_hand['betting_rounds'][game['round_stage']]       
-        # Record action
-        current_round['actions'].append({
-            'action': action,
-            'amount': amount if amount is not None else 0,
-            'timestamp': time.time(),
-            'pot_size': game['active_pot'],
-            'current_bet': game['current_highest_bet']
-        })        
-        # Update statistics
-        stats = player_data['stats']
-        if action == 'fold':
-            stats['total_folds'] += 1
-        elif action == 'check':
-            stats['total_checks'] += 1
-        elif action == 'call':
-            stats['total_calls'] += 1
-            # For call action, calculate the actual amount called
-            to_call = game['current_highest_bet'] - player['current_bet']
-            call_amount = min(to_call, player['money']) if to_call > 0 else 0
-            current_hand['investment'] += call_amount
-        elif action == 'raise':
-            stats['total_raises'] += 1
-            stats['total_bets'] += 1
-            current_hand['investment'] += amount
-            
-            # Check for pre-flop raise
-            if game['round_stage'] == 'pre-flop':
-                stats['preflop_raise'] += 1
-
-    if action == 'fold':
-        player['has_folded'] = True
-    elif action == 'check':
-    # Player can only check if they've matched the current bet
-        if player['current_bet'] < game['current_highest_bet']:
-            emit('error', {'msg': f'Cannot check - must call {game["current_highest_bet"] - player["current_bet"]} more'})
-            return
-        player['moved'] = True
-    elif action == 'call':
-        to_call = game['current_highest_bet'] - player['current_bet']
-        if to_call <= 0:
-            emit('error', {'msg': 'Nothing to call.'})
-            return
-        if player['money'] >= to_call:
-            player['money'] -= to_call
-            player['current_bet'] += to_call
-            player['moved'] = True
-            game['active_pot'] += to_call
-        else:
-            # All-in call
-            player['current_bet'] += player['money']
-            game['active_pot'] += player['money']
-            player['money'] = 0
-            player['has_gone_all_in'] = True
-            player['moved'] = True
-    elif action == 'raise':
-        to_call = game['current_highest_bet'] - player['current_bet']
-        total_bet = to_call + amount
-        if amount <= 0:
-            emit('error', {'msg': 'Raise amount must be greater than 0.'})
-            return
-        if player['money'] >= total_bet:
-            player['money'] -= total_bet
-            player['current_bet'] += total_bet
-            game['current_highest_bet'] = player['current_bet']
-            game['last_raiser_index'] = game['current_player_index']
-            player['moved'] = True
-            game['active_pot'] += total_bet
-        else:
-            emit('error', {'msg': 'Not enough chips to raise.'})
-            return
-    else:
-        emit('error', {'msg': 'Invalid action.'})
-        return
-
-    # Update player's last action text and chips for UI
-    text = action.upper() if action != 'raise' else f"RAISES TO {player['current_bet']}"
-    player['last_action'] = text
-    
-    # Emit to ALL clients in the room
-    emit('update_action', {
-        'player_id': player_id,
-        'action_text': text,
-        'money': player['money'],
-        'pot': game['active_pot']
-    }, room=code)    
-    print(f"Emitted update_action for player {player_id} in room {code}")
-    # Advance to next active player (excluding sitting out and folded players)
-    total_players = len(game['players'])
-    next_index = (current_index + 1) % total_players
-    skipped_players = 0
-    while skipped_players < total_players:
-        next_player = game['players'][next_index]
-        if (not next_player.get('has_folded') and 
-            not next_player.get('has_gone_all_in') and 
-            not next_player.get('sitting_out', False) and  # Check if not sitting out
-            next_player['money'] > 0):  # Check if player has money
-            break
-        next_index = (next_index + 1) % total_players
-        skipped_players += 1
-    game['current_player_index'] = next_index
-
-    # Check if all active players have matched the bet
-    active_players = [
-        p for p in game['players']
-        if not p.get('has_folded') and not p.get('sitting_out', False)
-    ]
-    players_can_act = [
-        p for p in active_players
-        if (not p.get('has_gone_all_in')) and p.get('money', 0) > 0
-    ]
-
-    # Check if all active players have matched the bet
-    all_matched = True
-    for p in players_can_act:
-        if p['current_bet'] < game['current_highest_bet'] or not p.get('moved'):
-            all_matched = False
-            break
-
-    # If the betting round is complete AND no further betting is possible, go straight to showdown
-    no_more_betting_possible = (len(active_players) > 1 and len(players_can_act) <= 1)
-
-    if all_matched and no_more_betting_possible:
-        game['betting_round_active'] = False
-        game['round_stage'] = 'showdown'
-        # Reveal all community cards before showdown
-        community_cards = [Card.from_dict(card) for card in game['community_cards']]
-        for card in community_cards:
-            card.visible = True
-        game['community_cards'] = [card.to_dict() for card in community_cards]
-
-        socketio.emit('update_community_cards', {
-            'community_cards': game['community_cards']
-        }, room=code)
-        socketio.emit('update_stage', {
-            'stage': 'showdown',
-            'temp_status': 'No further betting possible - proceeding to showdown'
-        }, room=code)
-
-        socketio.start_background_task(process_showdown, code)
-        return
-
-    if all_matched:
-        game['betting_round_active'] = False
-        socketio.start_background_task(next_round_stage, code)
-    else:
-        emit('turn_update', {
-            'current_player_id': game['players'][next_index]['id']
-        }, room=code)
-
-
-@socketio.on('toggle_sit_out')
-def handle_toggle_sit_out(data):
+@table_command('toggle_sit_out')
+def handle_toggle_sit_out(sid, data):
     code = data['code']
     player_id = data['player_id']
     sit_out = data['sit_out']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    player = next((p for p in game['players'] if p['id'] == player_id), None)
+    player = game.seat(player_id)
     if not player:
-        emit('error', {'msg': 'Player not found.'})
+        socketio.emit('error', {'msg': 'Player not found.'}, room=sid)
         return
         
     # Update player's sit out next hand status (not current hand)
-    player['sit_out_next_hand'] = sit_out
+    player.sit_out_next_hand = sit_out
     
     # Broadcast the update to all clients
-    emit('player_sit_out_updated', {
+    socketio.emit('player_sit_out_updated', {
         'player_id': player_id,
         'sit_out_next_hand': sit_out
     }, room=code)
 
 # Socket event for buying back in
-@socketio.on('buy_back_in')
-def handle_buy_back(data):
+@table_command('buy_back_in')
+def handle_buy_back(sid, data):
     code = data['code']
     player_id = data['player_id']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    player = next((p for p in game['players'] if p['id'] == player_id), None)
+    player = game.seat(player_id)
     if not player:
-        emit('error', {'msg': 'Player not found.'})
+        socketio.emit('error', {'msg': 'Player not found.'}, room=sid)
         return
     
     # Check if player has no money
-    if player['money'] > 0:
-        emit('error', {'msg': 'You still have chips, no need to buy back in.'})
+    if player.money > 0:
+        socketio.emit('error', {'msg': 'You still have chips, no need to buy back in.'}, room=sid)
         return
     
     # Add buy-in amount to player's next hand money
-    player['buy_back_amount'] = game['buy_in']
-    player['is_out'] = False
-    player['sit_out_next_hand'] = True  # Will sit out current hand
+    player.buy_back_amount = game.buy_in
+    player.is_out = False
+    player.sit_out_next_hand = True  # Will sit out current hand
     
     # Update game_data with buy-in information
-    if code in game_data and player['name'] in game_data[code]:
-        game_data[code][player['name']]['total_buy_ins'] = game_data[code][player['name']].get('total_buy_ins', 0) + game['buy_in']
+    if code in game_data and player.name in game_data[code]:
+        game_data[code][player.name]['total_buy_ins'] = game_data[code][player.name].get('total_buy_ins', 0) + game.buy_in
     
     # Broadcast the update
-    emit('player_bought_back', {
+    socketio.emit('player_bought_back', {
         'player_id': player_id,
         'new_money': 0  # Still 0 for current hand
     }, room=code)
     
     # Update the player's display
-    emit('update_action', {
+    socketio.emit('update_action', {
         'player_id': player_id,
         'action_text': 'BOUGHT BACK IN (Plays Next Hand)',
         'money': 0,  # Still shows 0 for current hand
-        'pot': game['active_pot']
+        'pot': game.active_pot
     }, room=code)
 
-@socketio.on('buy_back_in_2')
-def handle_buy_back(data):
+@table_command('buy_back_in_2')
+def handle_buy_back(sid, data):
     code = data['code']
     player_id = data['player_id']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    player = next((p for p in game['players'] if p['id'] == player_id), None)
+    player = game.seat(player_id)
     if not player:
-        emit('error', {'msg': 'Player not found.'})
+        socketio.emit('error', {'msg': 'Player not found.'}, room=sid)
         return
     
     # Check if player has no money
-    if player['money'] > 0:
-        emit('error', {'msg': 'You still have chips, no need to buy back in.'})
+    if player.money > 0:
+        socketio.emit('error', {'msg': 'You still have chips, no need to buy back in.'}, room=sid)
         return
     
     # Add buy-in amount to player's next hand money
-    player['buy_back_amount'] = game['buy_in']
-    player['is_out'] = False
-    player['sit_out_next_hand'] = False  # Will sit out current hand
+    player.buy_back_amount = game.buy_in
+    player.is_out = False
+    player.sit_out_next_hand = False  # Will sit out current hand
     
     # Update game_data with buy-in information
-    if code in game_data and player['name'] in game_data[code]:
-        game_data[code][player['name']]['total_buy_ins'] = game_data[code][player['name']].get('total_buy_ins', 0) + game['buy_in']
+    if code in game_data and player.name in game_data[code]:
+        game_data[code][player.name]['total_buy_ins'] = game_data[code][player.name].get('total_buy_ins', 0) + game.buy_in
     
     # Broadcast the update
-    emit('player_bought_back', {
+    socketio.emit('player_bought_back', {
         'player_id': player_id,
         'new_money': 0  # Still 0 for current hand
     }, room=code)
     
     # Update the player's display
-    emit('update_action', {
+    socketio.emit('update_action', {
         'player_id': player_id,
         'action_text': 'BOUGHT BACK IN (Plays Next Hand)',
         'money': 0,  # Still shows 0 for current hand
-        'pot': game['active_pot']
+        'pot': game.active_pot
     }, room=code)
    
 # Socket event for voting to extend time
-@socketio.on('vote_buy_in')
-def handle_vote_buy_in(data):
+@table_command('vote_buy_in')
+def handle_vote_buy_in(sid, data):
     code = data['code']
     player_id = data['player_id']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    # Initialize vote counts if they don't exist
-    if 'buy_back_votes' not in game:
-        game['buy_back_votes'] = set()  # Use set to track unique players
-    if 'total_voters' not in game:
-        game['total_voters'] = set()
-        
-    game['buy_back_votes'].add(player_id)
-    game['total_voters'].add(player_id)
+    game.buy_back_votes.add(player_id)
+    game.total_voters.add(player_id)
     
-    total_players = len(game['players'])
-    buy_back_count = len(game['buy_back_votes'])
+    total_players = len(game.seats)
+    buy_back_count = len(game.buy_back_votes)
     
     print(f"Extend vote received from {player_id}: {buy_back_count}/{total_players} players voted to extend")
     
     # Check if all players have voted
-    if len(game['total_voters']) >= total_players:
+    if len(game.total_voters) >= total_players:
         process_voting_result_b(code)
     else:
         # Not all players have voted yet
-        emit('vote_update', {
+        socketio.emit('vote_update', {
             'buy_back_count': buy_back_count,
             'total_players': total_players
         }, room=code)
 
-@socketio.on('vote_end_game_b')
-def handle_vote_end_game_b(data):
+@table_command('vote_end_game_b')
+def handle_vote_end_game_b(sid, data):
     code = data['code']
     player_id = data['player_id']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    # Initialize vote counts if they don't exist
-    if 'total_voters' not in game:
-        game['total_voters'] = set()
-    if 'extend_votes' not in game:
-        game['buy_back_votes'] = set()
-        
     # Remove from extend votes if they were there
-    if player_id in game['buy_back_votes']:
-        game['buy_back_votes'].remove(player_id)
+    if player_id in game.buy_back_votes:
+        game.buy_back_votes.remove(player_id)
     
-    game['total_voters'].add(player_id)
+    game.total_voters.add(player_id)
     
-    total_players = len(game['players'])
-    buy_back_count = len(game['extend_votes'])
+    total_players = len(game.seats)
+    buy_back_count = len(game.extend_votes)
     
     print(f"End game vote received from {player_id}: {buy_back_count} players voted to extend")
     
     # Check if all players have voted
-    if len(game['total_voters']) >= total_players:
+    if len(game.total_voters) >= total_players:
         process_voting_result_b(code)
     else:
         # Not all players have voted yet
-        emit('vote_update', {
+        socketio.emit('vote_update', {
             'buy_back_count': buy_back_count,
             'total_players': total_players
         }, room=code)
@@ -1468,40 +1034,40 @@ def process_voting_result_b(code):
     if not game:
         return
     
-    buy_back_count = len(game.get('buy_back_votes', set()))
-    total_players = len(game['players'])
+    buy_back_count = len(game.buy_back_votes)
+    total_players = len(game.seats)
     
     print(f"Voting complete: {buy_back_count}/{total_players} players voted to extend")
     
     if buy_back_count >= 3:  # At least 3 players want to extend
         # Get the set of player IDs who voted to extend
-        players_in_ids = game['buy_back_votes']
+        players_in_ids = game.buy_back_votes
         
         # Filter players - keep only those who voted to extend
-        game['players'][:] = [p for p in game['players'] if p['id'] in players_in_ids]
+        game.keep_seats(players_in_ids)
 
         # Ensure busted players are funded for the next hand
-        for player in game['players']:
-            if player['money'] <= 0:
-                player['buy_back_amount'] = game['buy_in']
-                player['sit_out_next_hand'] = False
+        for player in game.seats:
+            if player.money <= 0:
+                player.buy_back_amount = game.buy_in
+                player.sit_out_next_hand = False
         
         
         # Reset vote counts
-        game['buy_back_votes'] = set()
-        game['total_voters'] = set()
+        game.buy_back_votes = set()
+        game.total_voters = set()
         # Start a new hand to continue the game
-        socketio.start_background_task(start_new_hand, code)
+        submit(code, start_new_hand, code)
 
         
         # Send time_extended to the game room (all connected clients will get it)
         # But only extending players will actually be in the game
-        emit('game_extended', {
+        socketio.emit('game_extended', {
         }, room=code)
         print(f"Game extended for {buy_back_count} players, starting new hand")
     else:
         # Not enough votes to extend - end the game for everyone
-        emit('end_game_b', {
+        socketio.emit('end_game_b', {
             'buy_back_count': buy_back_count,
             'total_players': total_players
         }, room=code)
@@ -1509,73 +1075,61 @@ def process_voting_result_b(code):
 
 
 # Socket event for voting to extend time
-@socketio.on('vote_extend_time')
-def handle_vote_extend_time(data):
+@table_command('vote_extend_time')
+def handle_vote_extend_time(sid, data):
     code = data['code']
     player_id = data['player_id']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    # Initialize vote counts if they don't exist
-    if 'extend_votes' not in game:
-        game['extend_votes'] = set()  # Use set to track unique players
-    if 'total_voters' not in game:
-        game['total_voters'] = set()
-        
-    game['extend_votes'].add(player_id)
-    game['total_voters'].add(player_id)
+    game.extend_votes.add(player_id)
+    game.total_voters.add(player_id)
     
-    total_players = len(game['players'])
-    extend_count = len(game['extend_votes'])
+    total_players = len(game.seats)
+    extend_count = len(game.extend_votes)
     
     print(f"Extend vote received from {player_id}: {extend_count}/{total_players} players voted to extend")
     
     # Check if all players have voted
-    if len(game['total_voters']) >= total_players:
+    if len(game.total_voters) >= total_players:
         process_voting_result_s(code)
     else:
         # Not all players have voted yet
-        emit('vote_update', {
+        socketio.emit('vote_update', {
             'extend_count': extend_count,
             'total_players': total_players
         }, room=code)
 
-@socketio.on('vote_end_game_s')
-def handle_vote_end_game_s(data):
+@table_command('vote_end_game_s')
+def handle_vote_end_game_s(sid, data):
     code = data['code']
     player_id = data['player_id']
     
     game = games.get(code)
     if not game:
-        emit('error', {'msg': 'Game not found.'})
+        socketio.emit('error', {'msg': 'Game not found.'}, room=sid)
         return
         
-    # Initialize vote counts if they don't exist
-    if 'total_voters' not in game:
-        game['total_voters'] = set()
-    if 'extend_votes' not in game:
-        game['extend_votes'] = set()
-        
     # Remove from extend votes if they were there
-    if player_id in game['extend_votes']:
-        game['extend_votes'].remove(player_id)
+    if player_id in game.extend_votes:
+        game.extend_votes.remove(player_id)
     
-    game['total_voters'].add(player_id)
+    game.total_voters.add(player_id)
     
-    total_players = len(game['players'])
-    extend_count = len(game['extend_votes'])
+    total_players = len(game.seats)
+    extend_count = len(game.extend_votes)
     
     print(f"End game vote received from {player_id}: {extend_count} players voted to extend")
     
     # Check if all players have voted
-    if len(game['total_voters']) >= total_players:
+    if len(game.total_voters) >= total_players:
         process_voting_result_s(code)
     else:
         # Not all players have voted yet
-        emit('vote_update', {
+        socketio.emit('vote_update', {
             'extend_count': extend_count,
             'total_players': total_players
         }, room=code)
@@ -1586,40 +1140,40 @@ def process_voting_result_s(code):
     if not game:
         return
     
-    extend_count = len(game.get('extend_votes', set()))
-    total_players = len(game['players'])
+    extend_count = len(game.extend_votes)
+    total_players = len(game.seats)
     
     print(f"Voting complete: {extend_count}/{total_players} players voted to extend")
     
     if extend_count >= 3:  # At least 3 players want to extend
         # Get the set of player IDs who voted to extend
-        players_in_ids = game['extend_votes']
+        players_in_ids = game.extend_votes
         
         # Filter players - keep only those who voted to extend
-        game['players'][:] = [p for p in game['players'] if p['id'] in players_in_ids]
+        game.keep_seats(players_in_ids)
         
         # Reset the timer with extended time
-        extended_time = game['time_limit'] // 2
+        extended_time = game.time_limit // 2
         start_game_timer(code, extended_time)
-        game['time_expired'] = False
+        game.time_expired = False
         
         # Reset vote counts
-        game['extend_votes'] = set()
-        game['total_voters'] = set()
+        game.extend_votes = set()
+        game.total_voters = set()
         
         # Start a new hand to continue the game
-        socketio.start_background_task(start_new_hand, code)
+        submit(code, start_new_hand, code)
         
         # Send time_extended to the game room (all connected clients will get it)
         # But only extending players will actually be in the game
-        emit('time_extended', {
+        socketio.emit('time_extended', {
             'extended_minutes': extended_time
         }, room=code)
         
         print(f"Game extended for {extend_count} players, starting new hand")
     else:
         # Not enough votes to extend - end the game for everyone
-        emit('end_game_s', {
+        socketio.emit('end_game_s', {
             'extend_count': extend_count,
             'total_players': total_players
         }, room=code)
@@ -1631,22 +1185,21 @@ def handle_turn_update(data):
     current_player_id = data['current_player_id']
     emit('turn_update', {'current_player_id': current_player_id}, room=room)
     
-@socketio.on('start_betting_round')
-def start_betting_round(data):
+@table_command('start_betting_round')
+def start_betting_round(sid, data):
     code = data['code']
     game = games[code]
 
-    game['last_raiser_index'] = None
-    game['current_player_index'] = 0
-    game['betting_round_active'] = True
+    for player in game.seats:
+        player.has_folded = False
+        player.has_gone_all_in = False
 
-    for player in game['players']:
-        player['has_folded'] = False
-        player['has_gone_all_in'] = False
+    game.betting.begin(game.seats, 0, game.current_highest_bet)
+    game.current_player_index = game.betting.current
+    game.betting_round_active = True
 
-    emit('turn_update', {
-        'current_player_id': game['players'][0]['id']
-    }, room=code)
+    start_turn_clock(code, game)
+    socketio.emit('turn_update', turn_state(game), room=code)
 
 # Socket event for requesting personal analysis during game
 @socketio.on('request_personal_analysis')
@@ -1659,15 +1212,15 @@ def handle_personal_analysis(data):
         emit('error', {'msg': 'Game not found.'})
         return
         
-    player = next((p for p in game['players'] if p['id'] == player_id), None)
+    player = game.seat(player_id)
     if not player:
         emit('error', {'msg': 'Player not found.'})
         return
     
     # Generate report for this player only
-    if code in game_data and player['name'] in game_data[code]:
-        player_data = game_data[code][player['name']]
-        player_data = calculate_player_statistics(player_data, player['name'])
+    if code in game_data and player.name in game_data[code]:
+        player_data = game_data[code][player.name]
+        player_data = calculate_player_statistics(player_data, player.name, game_data[code])
         
         # Generate playing style
         style, player_type, risk_score = generate_playing_style(player_data)
@@ -1677,7 +1230,7 @@ def handle_personal_analysis(data):
         # Generate personal summary
         stats = player_data['stats']
         summary = f"""
-Player: {player['name']}
+Player: {player.name}
 Playing Style: {style} ({player_type})
 Risk Score: {risk_score:.1f}/100
 
@@ -1688,6 +1241,8 @@ Key Statistics:
 - Aggression Factor: {stats['aggression_factor']:.1f}
 - Hands Played: {stats['hands_played']}
 - Win Rate: {stats['win_rate']:.1f}%
+- Preflop Equity: {stats['preflop_equity']:.1f}% dealt, {stats['vpip_preflop_equity']:.1f}% played
+- VPIP Range Equity: {stats['vpip_range_equity']:.1f}% against the table's VPIP range
 - Total Profit: ${player_data['total_profit']:.2f}
 - Total Buy-ins: ${player_data.get('total_buy_ins', 0):.2f}
 
@@ -1710,7 +1265,7 @@ Notable Achievements:
         
         # Send personal report to this player only
         emit('personal_analysis_report', {
-            'player_name': player['name'],
+            'player_name': player.name,
             'style': style,
             'player_type': player_type,
             'risk_score': risk_score,
@@ -1721,8 +1276,27 @@ Notable Achievements:
             'total_buy_ins': player_data.get('total_buy_ins', 0)
         }, room=request.sid)
 
-def calculate_player_statistics(player_data, player_name):
-    """Calculate comprehensive player statistics from tracked data"""
+def calc_vpip_range_equity(player_data, player_name, table_data):
+    """Equity of a player's VPIP range against everyone else's combined, in percent"""
+    hero = vpip_range(player_data)
+    others = Counter()
+    for name, other_data in table_data.items():
+        if name != player_name:
+            others.update(vpip_range(other_data))
+    if not preflop_table or not hero or not others:
+        return 0
+    try:
+        result = range_equity(hero, others, preflop=preflop_table)
+    except ValueError:
+        return 0
+    return result['players'][0]['equity'] * 100
+
+def calculate_player_statistics(player_data, player_name, table_data=None):
+    """Calculate comprehensive player statistics from tracked data
+
+    table_data is the game's game_data entry, used to compare the hands
+    this player chose to play with the ones everyone else did.
+    """
     stats = player_data['stats']
     hands = player_data['hands']
     
@@ -1734,14 +1308,26 @@ def calculate_player_statistics(player_data, player_name):
     
     # Calculate VPIP (Voluntarily Put $ In Pot)
     vpip_hands = 0
+    dealt_equities = []
+    vpip_equities = []
     for hand_num, hand_data in hands.items():
         preflop_actions = hand_data['betting_rounds']['pre-flop']['actions']
         # Count if player voluntarily put money in pot (not including blinds)
         voluntary_actions = [a for a in preflop_actions if a['action'] in ['call', 'raise']]
         if voluntary_actions:
             vpip_hands += 1
+        
+        # Preflop strength of the hole cards, as equity against one random hand
+        if preflop_table and hand_data['hole_cards']:
+            equity = preflop_table.multiway(hand_class(hand_data['hole_cards']), 2) * 100
+            dealt_equities.append(equity)
+            if voluntary_actions:
+                vpip_equities.append(equity)
     
     stats['vpip'] = (vpip_hands / total_hands * 100) if total_hands > 0 else 0
+    stats['preflop_equity'] = sum(dealt_equities) / len(dealt_equities) if dealt_equities else 0
+    stats['vpip_preflop_equity'] = sum(vpip_equities) / len(vpip_equities) if vpip_equities else 0
+    stats['vpip_range_equity'] = calc_vpip_range_equity(player_data, player_name, table_data or {})
     
     # Calculate PFR (Pre-Flop Raise)
     pfr_hands = 0
@@ -1859,7 +1445,7 @@ def generate_player_reports(game_code):
     
     for player_name, player_data in game_data[game_code].items():
         # Calculate statistics
-        player_data = calculate_player_statistics(player_data, player_name)
+        player_data = calculate_player_statistics(player_data, player_name, game_data[game_code])
         
         # Generate playing style
         style, player_type, risk_score = generate_playing_style(player_data)
@@ -1880,6 +1466,8 @@ Key Statistics:
 - Aggression Factor: {stats['aggression_factor']:.1f}
 - Hands Played: {stats['hands_played']}
 - Win Rate: {stats['win_rate']:.1f}%
+- Preflop Equity: {stats['preflop_equity']:.1f}% dealt, {stats['vpip_preflop_equity']:.1f}% played
+- VPIP Range Equity: {stats['vpip_range_equity']:.1f}% against the table's VPIP range
 - Total Profit: ${player_data['total_profit']:.2f}
 - Total Buy-ins: ${player_data.get('total_buy_ins', 0):.2f}
 
@@ -0,0 +1,60 @@
+import numpy as np
+from evaluator import (RANK_KEY, SUIT_KEY, CARD_BIT, RANK_TABLE, FLUSH_TABLE,
+                       FLUSH_CHECK_ADD, FLUSH_CHECK_MASK, CATEGORY_SHIFT)
+
+# numpy mirrors of the scalar evaluator tables
+_RANK_KEY = np.array(RANK_KEY, dtype=np.int64)
+_SUIT_KEY = np.array(SUIT_KEY, dtype=np.int64)
+_CARD_BIT = np.array(CARD_BIT, dtype=np.int64)
+_FLUSH_TABLE = np.array(FLUSH_TABLE, dtype=np.int64)
+
+# RANK_TABLE is sparse, so keep it as sorted keys for searchsorted
+_rank_items = sorted(RANK_TABLE.items())
+_RANK_KEYS = np.array([key for key, _ in _rank_items], dtype=np.int64)
+_RANK_SCORES = np.array([score for _, score in _rank_items], dtype=np.int64)
+del _rank_items
+
+# Suit index from the bit left behind by the flush check
+_FLUSH_SHIFT_BY_SUIT = np.array([0, 13, 26, 39], dtype=np.int64)
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _evaluate_chunk(codes):
+    rank_keys = _RANK_KEY[codes].sum(axis=1)
+    suit_keys = _SUIT_KEY[codes].sum(axis=1)
+    masks = np.bitwise_or.reduce(_CARD_BIT[codes], axis=1)
+
+    scores = _RANK_SCORES[np.searchsorted(_RANK_KEYS, rank_keys)]
+
+    flush_bits = (suit_keys + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    flushes = np.nonzero(flush_bits)[0]
+    if flushes.size:
+        # only one of bits 3, 7, 11, 15 is set, count how far up it is
+        bits = flush_bits[flushes]
+        suits = (bits > 0x8).astype(np.int64) + (bits > 0x80) + (bits > 0x800)
+        suit_masks = (masks[flushes] >> _FLUSH_SHIFT_BY_SUIT[suits]) & 0x1FFF
+        scores[flushes] = _FLUSH_TABLE[suit_masks]
+    return scores
+
+
+def evaluate_batch(codes, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score an (N, 5..7) array of card codes, returns N packed scores
+
+    Scores are identical to evaluator.evaluate, so hand_category and
+    get_hand_description work on every element.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    if codes.ndim != 2 or not 5 <= codes.shape[1] <= 7:
+        raise ValueError("codes must have shape (N, 5), (N, 6) or (N, 7)")
+
+    scores = np.empty(codes.shape[0], dtype=np.int64)
+    for start in range(0, codes.shape[0], chunk_size):
+        stop = start + chunk_size
+        scores[start:stop] = _evaluate_chunk(codes[start:stop])
+    return scores
+
+
+def hand_categories(scores):
+    """Vectorized evaluator.hand_category"""
+    return np.asarray(scores) >> CATEGORY_SHIFT
@@ -0,0 +1,102 @@
+def in_hand(seat):
+    """True if the seat holds live cards in the current hand"""
+    return not seat.has_folded and not seat.sitting_out and len(seat.holecards) == 2
+
+
+def can_act(seat):
+    """True if the seat is in the hand with chips left to bet"""
+    return in_hand(seat) and not seat.has_gone_all_in and seat.money > 0
+
+
+class BettingRound:
+    """Who still has to act on one street, updated as each player acts
+
+    begin() looks at every seat once when a street opens. After that act()
+    keeps the counts and a ring of the seats that can still act up to
+    date, so whether the round is over and whose turn is next are both
+    answered without scanning the table.
+    """
+    __slots__ = ("highest_bet", "last_aggressor", "pending", "live", "acting",
+                 "folds", "all_ins", "current", "_next", "_prev")
+
+    def __init__(self):
+        self.highest_bet = 0
+        self.last_aggressor = None
+        self.pending = 0  # players who still have to act before the street ends
+        self.live = 0  # players in the hand, all-in or not
+        self.acting = 0  # players in the hand who can still bet
+        self.folds = 0
+        self.all_ins = 0
+        self.current = None
+        self._next = []
+        self._prev = []
+
+    def begin(self, seats, first, highest_bet, last_aggressor=None):
+        """Open a street with the first to act at or after seat `first`"""
+        n = len(seats)
+        live = [i for i in range(n) if in_hand(seats[i])]
+        ring = [i for i in live if can_act(seats[i])]
+        self.highest_bet = highest_bet
+        self.last_aggressor = last_aggressor
+        self.live = len(live)
+        self.acting = len(ring)
+        self.folds = 0
+        self.all_ins = len(live) - len(ring)
+
+        self._next = [None] * n
+        self._prev = [None] * n
+        for k, i in enumerate(ring):
+            self._next[i] = ring[(k + 1) % len(ring)]
+            self._prev[i] = ring[k - 1]
+
+        self.pending = len(ring)
+        if len(ring) == 1 and (self.live == 1 or seats[ring[0]].current_bet >= highest_bet):
+            # Nobody left to bet against, or nothing left to call
+            self.pending = 0
+        self.current = next((i for i in ring if i >= first), ring[0] if ring else None)
+
+    def act(self, index, seat, raised=False):
+        """Record the action seat `index` just took and move the turn on"""
+        following = self._next[index]
+        if seat.has_folded:
+            self._unlink(index)
+            self.live -= 1
+            self.folds += 1
+        elif not can_act(seat):
+            self._unlink(index)
+            self.all_ins += 1
+
+        if raised:
+            # Everyone else who can still bet has to answer the raise
+            self.highest_bet = seat.current_bet
+            self.last_aggressor = index
+            self.pending = self.acting - (1 if self._next[index] is not None else 0)
+        else:
+            self.pending -= 1
+
+        if not self.acting:
+            self.current = None
+        elif following == index:
+            self.current = index
+        else:
+            self.current = following
+
+    def _unlink(self, index):
+        following, previous = self._next[index], self._prev[index]
+        if following != index:
+            self._next[previous] = following
+            self._prev[following] = previous
+        self._next[index] = self._prev[index] = None
+        self.acting -= 1
+
+    def is_over(self):
+        """No one has to act again on this street"""
+        return self.pending <= 0 or self.live <= 1
+
+    def hand_over(self):
+        """Everyone but one player has folded"""
+        return self.live <= 1
+
+    def runout(self):
+        """The street is over and no one can bet on later streets either"""
+        return self.is_over() and self.live > 1 and self.acting <= 1
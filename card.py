@@ -4,11 +4,20 @@ RANKS = {
     8: "08", 9: "09", 10: "10", 11: "jack", 12: "queen", 13: "king", 14: "ace"
 }
 
+def card_code(suit: int, rank: int) -> int:
+    # 0-51, rank-major so code // 4 is rank - 2 and code % 4 is suit - 1
+    return (rank - 2) * 4 + (suit - 1)
+
 class Card:
+    # There are only 52 of these (see CARDS), shared by every deck, hand
+    # and board. Whether a card is face up depends on who is looking, so
+    # visibility is passed in when a card is drawn instead of stored.
+    __slots__ = ("suit", "rank", "code")
+
     def __init__(self, suit: int, rank: int):
         self.suit = suit
         self.rank = rank
-        self.visible = False
+        self.code = card_code(suit, rank)
     
     def __str__(self):
         return f"{RANKS[self.rank]} of {SUITS[self.suit]}"
@@ -16,24 +25,39 @@ class Card:
     def __repr__(self):
         return self.__str__()
 
-    def get_image_filename(self):
-        if self.visible:
+    def to_code(self):
+        return self.code
+
+    def get_image_filename(self, visible=False):
+        if visible:
             suit_name = SUITS[self.suit]
             rank_name = RANKS[self.rank]
             return f"{suit_name}_{rank_name}.png"
         else:
             return "back01.png"
 
-    def to_dict(self):
+    def to_dict(self, visible=False):
         return {
             "suit": self.suit,
             "rank": self.rank,
-            "visible": self.visible,
-            "image_filename": self.get_image_filename()
+            "visible": visible,
+            "image_filename": self.get_image_filename(visible)
         }
 
+    @classmethod
+    def from_code(cls, code: int):
+        return CARDS[code]
+
     @classmethod
     def from_dict(cls, data):
-        card = cls(data["suit"], data["rank"])
-        card.visible = data.get("visible", False)
-        return card
+        return CARDS[card_code(data["suit"], data["rank"])]
+
+CARDS = tuple(Card(code % 4 + 1, code // 4 + 2) for code in range(52))
+
+def card_dicts(codes, visible=False):
+    # Card codes to the dicts the templates and socket events expect
+    return [CARDS[code].to_dict(visible) for code in codes]
+
+def board_dicts(codes, shown):
+    # The board with its first `shown` cards face up
+    return [CARDS[code].to_dict(i < shown) for i, code in enumerate(codes)]
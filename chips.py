@@ -0,0 +1,92 @@
+import os
+
+# Conservation checks are cheap, keep them on unless told otherwise
+CHECK_CHIPS = os.environ.get("POKER_CHECK_CHIPS", "1") != "0"
+
+
+class ChipError(Exception):
+    """Chips were created or lost somewhere"""
+
+
+def whole_chips(value):
+    """A bet amount from a client as a whole number of chips"""
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        amount = int(value)
+    except (TypeError, ValueError):
+        amount = None
+    if amount is None or amount != float(value):
+        raise ValueError("Amounts must be a whole number of chips.")
+    return amount
+
+
+class ChipBank:
+    """Every chip that moves at a table goes through here
+
+    Chips are integers in the table's smallest unit. The bank keeps
+    running totals of the stacks and the pot, so after each move the
+    invariant stacks + pot == buy-ins is checked in O(1) without adding
+    the table up again. What a bet puts in the pot is recorded in the
+    hand's ContributionLedger as well.
+    """
+    __slots__ = ("ledger", "buy_ins", "stacks", "pot", "paid", "check")
+
+    def __init__(self, ledger, check=CHECK_CHIPS):
+        self.ledger = ledger
+        self.buy_ins = 0  # chips brought to the table by seats still at it
+        self.stacks = 0
+        self.pot = 0
+        self.paid = 0  # chips paid out of this hand's pot so far
+        self.check = check
+
+    def buy_in(self, seat, amount):
+        self._whole(amount)
+        seat.money += amount
+        self.buy_ins += amount
+        self.stacks += amount
+        self.verify()
+
+    def cash_out(self, seat):
+        """Take a leaving seat's stack off the table"""
+        self.buy_ins -= seat.money
+        self.stacks -= seat.money
+        self.verify()
+
+    def new_hand(self):
+        if self.check and self.pot:
+            raise ChipError(f"{self.pot} chips were never paid out of the last pot")
+        self.ledger.reset()
+        self.paid = 0
+
+    def bet(self, seat, amount):
+        """Move chips from a seat's stack into the pot"""
+        self._whole(amount)
+        if self.check and not 0 <= amount <= seat.money:
+            raise ChipError(f"{seat.name} can't put {amount} in with {seat.money} behind")
+        seat.money -= amount
+        self.stacks -= amount
+        self.pot += amount
+        self.ledger.add(seat.id, amount)
+        self.verify()
+
+    def award(self, seat, amount):
+        """Pay chips out of the pot to a winner"""
+        self._whole(amount)
+        if self.check and amount > self.pot:
+            raise ChipError(f"Can't pay {amount} out of a pot of {self.pot}")
+        seat.money += amount
+        self.stacks += amount
+        self.pot -= amount
+        self.paid += amount
+        self.verify()
+
+    def verify(self):
+        if self.check and (self.stacks + self.pot != self.buy_ins or
+                           self.pot + self.paid != self.ledger.total):
+            raise ChipError(f"stacks {self.stacks} + pot {self.pot} != buy-ins {self.buy_ins}, "
+                            f"ledger has {self.ledger.total} with {self.paid} paid out")
+
+    def _whole(self, amount):
+        if self.check and not isinstance(amount, int):
+            raise ChipError(f"{amount!r} is not a whole number of chips")
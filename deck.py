@@ -1,23 +1,72 @@
 import random
-from card import Card, SUITS, RANKS
+from card import CARDS
+
+DECK_SIZE = 52
 
 class Deck:
-    def __init__(self):
-        self.cards = [Card(suit, rank) for suit in SUITS for rank in RANKS]
-        random.shuffle(self.cards)
+    # The deck is a bytearray of card codes and a count of cards dealt.
+    # Dealing is a lazy Fisher-Yates shuffle: each deal swaps a random
+    # undealt card into the next position, so a hand only pays for the
+    # cards it actually deals, and any order is a valid starting point.
+    # `rng` is anything with randrange (random, a Random or SystemRandom
+    # instance); None means the order was shuffled up front by load().
+    def __init__(self, rng=random):
+        self.codes = bytearray(range(DECK_SIZE))
+        self.dealt = 0
+        self.rng = rng
+
+    def __len__(self):
+        return DECK_SIZE - self.dealt
+
+    def reset(self, rng=random):
+        # Put every card back without reallocating
+        self.dealt = 0
+        self.rng = rng
+
+    def load(self, order, rng=None):
+        # Start from a given order, dealt as is when rng is None (it was
+        # shuffled up front) or shuffled lazily from rng as usual
+        self.codes[:] = order
+        self.dealt = 0
+        self.rng = rng
+
+    def deal_code(self):
+        if self.dealt == DECK_SIZE:
+            return None
+        i = self.dealt
+        codes = self.codes
+        if self.rng is not None:
+            j = self.rng.randrange(i, DECK_SIZE)
+            codes[i], codes[j] = codes[j], codes[i]
+        self.dealt = i + 1
+        return codes[i]
 
     def deal_card(self):
-        if not self.cards:
+        code = self.deal_code()
+        if code is None:
             return None
-        return self.cards.pop()
+        return CARDS[code]
+
     def shuffle(self):
-        random.shuffle(self.cards)
+        # Undealt cards are always drawn at random, nothing to do
+        pass
+
+    def to_bytes(self):
+        # 52 card codes then the number dealt
+        return bytes(self.codes) + bytes([self.dealt])
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) != DECK_SIZE + 1 or sorted(data[:DECK_SIZE]) != list(range(DECK_SIZE)):
+            raise ValueError("not a serialized deck")
+        deck = cls()
+        deck.codes[:] = data[:DECK_SIZE]
+        deck.dealt = data[DECK_SIZE]
+        return deck
+
     def to_dict(self):
-        # serialize each card
-        return [card.to_dict() for card in self.cards]
+        return self.to_bytes().hex()
 
     @classmethod
     def from_dict(cls, data):
-        # data is a list of card dicts
-        cards = [Card.from_dict(cd) for cd in data]
-        return cls(cards)
\ No newline at end of file
+        return cls.from_bytes(bytes.fromhex(data))
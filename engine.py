@@ -0,0 +1,302 @@
+"""Texas hold'em rules for one Table, with no I/O
+
+Every step takes the table, changes it and returns a list of
+(event, data) tuples saying what happened. The last event says what the
+table is waiting for:
+
+    ("turn", {"player_id"})      the player has to act(), see ActionError
+    ("street_over", {"stage"})   call deal_street()
+    ("runout", {"hands", "board"})  nobody can bet any more, call reveal() and settle()
+    ("showdown", {})             call reveal() and settle()
+    ("hand_complete", {"shuffle"}) call start_hand() for the next one
+    ("game_over", {"winner_id"}) fewer than two players can be dealt in
+
+Adapters (app.py for the web, TexasHoldemGame for the terminal) turn the
+events into messages and decide how long to pause between steps.
+"""
+from betting import in_hand
+from evaluator import evaluate, hand_category
+from showdown import rank_players, award_pots
+from table import BOARD_SHOWN
+
+STREETS = ['pre-flop', 'flop', 'turn', 'river']
+
+HAND_NAMES = {
+    10: "Royal Flush",
+    9: "Straight Flush",
+    8: "Four of a Kind",
+    7: "Full House",
+    6: "Flush",
+    5: "Straight",
+    4: "Three of a Kind",
+    3: "Two Pair",
+    2: "One Pair",
+    1: "High Card"
+}
+
+
+class ActionError(ValueError):
+    """An action the rules don't allow right now, the message says why"""
+
+
+def calc_hand(community_cards, hole_cards):
+    """Score a player's best hand as a single comparable int"""
+    return evaluate(community_cards + hole_cards)
+
+
+def hand_description(hand_score):
+    """Convert hand score to human readable description"""
+    if not hand_score:
+        return "No hand"
+    return HAND_NAMES.get(hand_category(hand_score), "Unknown Hand")
+
+
+def dealt_in(seat):
+    """True if the seat gets cards next hand"""
+    return seat.money > 0 and not seat.is_out and not seat.sit_out_next_hand
+
+
+def next_active(table, start):
+    """Index of the first seat at or after `start` that gets dealt in"""
+    n = len(table.seats)
+    for i in range(n):
+        index = (start + i) % n
+        if dealt_in(table.seats[index]):
+            return index
+    return start % n
+
+
+def start_hand(table, shuffle_source=None, first=False):
+    """Shuffle, deal, move the button and post the blinds
+
+    The first hand keeps the button where the table put it. Without a
+    shuffle source the deck is shuffled with the random module.
+    """
+    if not first:
+        table.hand += 1
+
+    for seat in table.seats:
+        seat.current_bet = 0
+        # Chips bought back in arrive before the next hand
+        if seat.buy_back_amount:
+            table.chips.buy_in(seat, seat.buy_back_amount)
+            seat.buy_back_amount = None
+            seat.sit_out_next_hand = False
+
+    playing = [seat for seat in table.seats if dealt_in(seat)]
+    if len(playing) < 2:
+        table.betting_round_active = False
+        return [("game_over", {"winner_id": playing[0].id if playing else None})]
+
+    if shuffle_source is None:
+        table.deck.reset()
+        table.shuffle = None
+        table.shuffle_reveal = None
+    else:
+        table.shuffle = shuffle_source.start_hand(table.deck, f"{table.code}:{table.hand}")
+        # Kept back until the hand is over, see settle()
+        table.shuffle_reveal = table.shuffle.pop("reveal", None)
+
+    for seat in table.seats:
+        if dealt_in(seat):
+            seat.holecards = [table.deck.deal_code() for _ in range(2)]
+            seat.has_folded = False
+            seat.has_gone_all_in = False
+            seat.last_action = None
+            seat.hand_description = None
+            seat.handscores = 0
+            seat.sitting_out = False
+        else:
+            # No cards this hand, drop last hand's so they can't collide with this deck
+            seat.holecards = []
+            if seat.sit_out_next_hand:
+                seat.sitting_out = True
+                seat.is_out = False
+
+    # Community cards are dealt face down and turned over street by street
+    table.community_cards = [table.deck.deal_code() for _ in range(5)]
+    table.board_shown = 0
+    table.round_stage = 'pre-flop'
+    table.pots = []
+
+    if not first:
+        table.dealer_position = next_active(table, table.dealer_position + 1)
+    table.small_blind_pos = next_active(table, table.dealer_position + 1)
+    table.big_blind_pos = next_active(table, table.small_blind_pos + 1)
+
+    sb_player = table.seats[table.small_blind_pos]
+    bb_player = table.seats[table.big_blind_pos]
+    sb_amount = min(table.small_blind, sb_player.money)
+    bb_amount = min(table.big_blind, bb_player.money)
+    table.chips.new_hand()
+    _post(table, sb_player, sb_amount)
+    _post(table, bb_player, bb_amount)
+    table.current_highest_bet = bb_amount
+
+    # Action starts after the big blind, who is the last aggressor
+    table.betting.begin(table.seats, next_active(table, table.big_blind_pos + 1),
+                        bb_amount, table.big_blind_pos)
+    events = [("hand_started", {
+        "hand": table.hand,
+        "blinds": {sb_player.id: sb_amount, bb_player.id: bb_amount},
+    })]
+    return events + _next_step(table)
+
+
+def _post(table, seat, amount):
+    table.chips.bet(seat, amount)
+    seat.current_bet = amount
+    if seat.money == 0:
+        seat.has_gone_all_in = True
+
+
+def act(table, player_id, action, amount=0):
+    """Apply one player's fold, check, call or raise
+
+    amount is what a raise adds on top of calling. Raises ActionError,
+    leaving the table unchanged, when the action isn't allowed.
+    """
+    if not table.betting_round_active:
+        raise ActionError('Betting round not active')
+    seat = table.seat(player_id)
+    if not seat:
+        raise ActionError('Player not found.')
+    if seat.sitting_out:
+        raise ActionError('You are sitting out this hand.')
+    index = table.current_player_index
+    if seat is not table.seats[index]:
+        raise ActionError('Not your turn!')
+
+    stage = table.round_stage
+    highest_bet = table.current_highest_bet
+    to_call = highest_bet - seat.current_bet
+    if action == 'fold':
+        chips = 0
+        seat.has_folded = True
+        table.ledger.fold(seat.id)
+    elif action == 'check':
+        # Player can only check if they've matched the current bet
+        if to_call > 0:
+            raise ActionError(f'Cannot check - must call {to_call} more')
+        chips = 0
+    elif action == 'call':
+        if to_call <= 0:
+            raise ActionError('Nothing to call.')
+        # Calling with too few chips puts the player all in
+        chips = min(to_call, seat.money)
+    elif action == 'raise':
+        if amount <= 0:
+            raise ActionError('Raise amount must be greater than 0.')
+        chips = to_call + amount
+        if seat.money < chips:
+            raise ActionError('Not enough chips to raise.')
+    else:
+        raise ActionError('Invalid action.')
+
+    if chips:
+        table.chips.bet(seat, chips)
+        seat.current_bet += chips
+        if seat.money == 0:
+            seat.has_gone_all_in = True
+    if action == 'raise':
+        table.current_highest_bet = seat.current_bet
+
+    text = action.upper() if action != 'raise' else f"RAISES TO {seat.current_bet}"
+    seat.last_action = text
+    table.betting.act(index, seat, raised=action == 'raise')
+    events = [("action", {
+        "player_id": seat.id,
+        "action": action,
+        "stage": stage,
+        "highest_bet": highest_bet,  # the bet to match before this action
+        "text": text,
+        "chips": chips,
+        "money": seat.money,
+        "pot": table.active_pot,
+    })]
+    return events + _next_step(table)
+
+
+def deal_street(table):
+    """Turn over the next street's cards and open its betting
+
+    After the river this moves the hand to the showdown.
+    """
+    if table.round_stage == 'river':
+        stage = 'showdown'
+    else:
+        stage = STREETS[STREETS.index(table.round_stage) + 1]
+    table.round_stage = stage
+    table.board_shown = BOARD_SHOWN.get(stage, 5)
+    events = [("street", {"stage": stage})]
+    if stage == 'showdown':
+        table.betting_round_active = False
+        return events + [("showdown", {})]
+
+    # Post-flop streets start with the first player after the dealer
+    # who can still bet
+    table.betting.begin(table.seats, (table.dealer_position + 1) % len(table.seats),
+                        table.current_highest_bet)
+    return events + _next_step(table)
+
+
+def _next_step(table):
+    # What the hand waits for now, from the betting round's counts
+    betting = table.betting
+    if betting.hand_over():
+        # Everyone else folded, the last player takes the pot
+        table.betting_round_active = False
+        table.round_stage = 'showdown'
+        return [("showdown", {})]
+    if betting.runout():
+        # No further betting is possible, turn the whole board over
+        table.betting_round_active = False
+        table.round_stage = 'showdown'
+        # What the table could see before the board is turned over
+        hands = {seat.id: seat.holecards for seat in table.seats if in_hand(seat)}
+        board = table.community_cards[:table.board_shown]
+        table.board_shown = 5
+        return [("runout", {"hands": hands, "board": board})]
+    if betting.is_over():
+        table.betting_round_active = False
+        return [("street_over", {"stage": table.round_stage})]
+    table.current_player_index = betting.current
+    table.betting_round_active = True
+    return [("turn", {"player_id": table.current_seat().id})]
+
+
+def reveal(table):
+    """Score every live hand for the showdown"""
+    scores = {}
+    for seat in table.seats:
+        if seat.has_folded:
+            seat.hand_description = 'Folded'
+        elif in_hand(seat):
+            seat.handscores = calc_hand(table.community_cards, seat.holecards)
+            seat.hand_description = hand_description(seat.handscores)
+            scores[seat.id] = seat.handscores
+    return [("hands_shown", {"scores": scores})]
+
+
+def settle(table):
+    """Build the pots and pay each one to its best eligible hands"""
+    # The ledger has every chip put in this hand, folded players included
+    table.pots = table.ledger.pots()
+    for seat in table.seats:
+        seat.current_bet = 0
+
+    scores = {seat.id: seat.handscores for seat in table.seats if in_hand(seat)}
+    total_players = len(table.seats)
+    seat_order = [table.seats[(table.dealer_position + 1 + i) % total_players].id for i in range(total_players)]
+    ranking = rank_players(scores, seat_order)
+    events = []
+    for award in award_pots(table.pots, scores, ranking):
+        table.chips.award(table.seat(award['player']), award['amount'])
+        events.append(("pot_awarded", award))
+
+    table.first_hand_completed = True
+    # The hand is over, publish what the shuffle committed to
+    if table.shuffle_reveal:
+        table.shuffle.update(table.shuffle_reveal)
+        table.shuffle_reveal = None
+    return events + [("hand_complete", {"shuffle": table.shuffle})]
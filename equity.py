@@ -0,0 +1,192 @@
+import math
+import os
+import random
+from itertools import combinations
+from evaluator import RANK_KEY, SUIT_KEY, CARD_BIT, hand_keys, lookup
+
+DEFAULT_SAMPLES = 20000
+DEFAULT_TARGET_ERROR = 0.005
+DEFAULT_BATCH_SIZE = 1000
+# Enumerate exactly when at most this many board cards are still to come
+EXACT_MAX_TO_COME = 2
+
+
+def remaining_deck(hands, board, dead=()):
+    """Card codes not held by any player, on the board or dead"""
+    used = set(board) | set(dead)
+    for hand in hands:
+        used.update(hand)
+    return [code for code in range(52) if code not in used]
+
+
+def _new_totals(players):
+    return {
+        "samples": 0,
+        "wins": [0] * players,
+        "ties": [0] * players,
+        "shares": [0.0] * players,
+        "squares": [0.0] * players,
+    }
+
+
+def _add_showdown(totals, scores):
+    # Record one runout: outright win, or an equal share of a tie
+    best = max(scores)
+    winners = [i for i, score in enumerate(scores) if score == best]
+    share = 1.0 / len(winners)
+    for i in winners:
+        if len(winners) == 1:
+            totals["wins"][i] += 1
+        else:
+            totals["ties"][i] += 1
+        totals["shares"][i] += share
+        totals["squares"][i] += share * share
+    totals["samples"] += 1
+
+
+def _merge_totals(totals, batch):
+    totals["samples"] += batch["samples"]
+    for field in ("wins", "ties", "shares", "squares"):
+        totals[field] = [a + b for a, b in zip(totals[field], batch[field])]
+
+
+def _standard_error(totals):
+    n = totals["samples"]
+    if n < 2:
+        return math.inf
+    worst = 0.0
+    for share, square in zip(totals["shares"], totals["squares"]):
+        mean = share / n
+        variance = max(square / n - mean * mean, 0.0)
+        worst = max(worst, math.sqrt(variance / n))
+    return worst
+
+
+def equity_result(totals, exact, error=0.0):
+    """Shape accumulated totals into the result returned by every engine"""
+    n = totals["samples"]
+    players = []
+    for win, tie, share in zip(totals["wins"], totals["ties"], totals["shares"]):
+        players.append({
+            "win": win / n if n else 0.0,
+            "tie": tie / n if n else 0.0,
+            "equity": share / n if n else 0.0,
+        })
+    return {
+        "players": players,
+        "samples": n,
+        "exact": exact,
+        "error": error,
+    }
+
+
+def _sample_batch(hands, board, deck, count, seed):
+    """Play out `count` random runouts, returns partial totals"""
+    rng = random.Random(seed)
+    board_rank, board_suit, board_mask = hand_keys(board)
+    hole_keys = [hand_keys(hand) for hand in hands]
+    to_come = 5 - len(board)
+    totals = _new_totals(len(hands))
+
+    for _ in range(count):
+        rank_key, suit_key, mask = board_rank, board_suit, board_mask
+        for code in rng.sample(deck, to_come):
+            rank_key += RANK_KEY[code]
+            suit_key += SUIT_KEY[code]
+            mask |= CARD_BIT[code]
+        scores = [lookup(rank_key + hole_rank, suit_key + hole_suit, mask | hole_mask)
+                  for hole_rank, hole_suit, hole_mask in hole_keys]
+        _add_showdown(totals, scores)
+    return totals
+
+
+def _run_batches(hands, board, deck, batches, executor):
+    # Yield batch totals in submission order. With an executor, submit a
+    # wave at a time so an early stop doesn't leave the whole budget
+    # queued on the pool.
+    if executor is None:
+        for count, seed in batches:
+            yield _sample_batch(hands, board, deck, count, seed)
+        return
+    wave = os.cpu_count() or 1
+    for start in range(0, len(batches), wave):
+        futures = [executor.submit(_sample_batch, hands, board, deck, count, seed)
+                   for count, seed in batches[start:start + wave]]
+        for future in futures:
+            yield future.result()
+
+
+def monte_carlo_equity(hands, board=(), dead=(), samples=DEFAULT_SAMPLES,
+                       target_error=DEFAULT_TARGET_ERROR, executor=None, seed=None,
+                       batch_size=DEFAULT_BATCH_SIZE):
+    """Estimate win/tie equity for each hand by sampling board runouts
+
+    hands is a list of 2-card code lists, board the 0-5 known board codes.
+    Sampling stops after `samples` runouts or once the largest standard
+    error drops below `target_error`. Batches are seeded from `seed` and
+    merged in order, so a seeded run gives the same numbers with or
+    without an executor (e.g. a ProcessPoolExecutor).
+    """
+    hands = [list(hand) for hand in hands]
+    board = list(board)
+    deck = remaining_deck(hands, board, dead)
+    complete = len(board) == 5
+    if complete:
+        # Nothing left to come, one showdown settles it
+        samples = batch_size = 1
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    batches = []
+    remaining = samples
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        batches.append((count, f"{seed}:{len(batches)}"))
+        remaining -= count
+
+    totals = _new_totals(len(hands))
+    error = math.inf
+    for batch in _run_batches(hands, board, deck, batches, executor):
+        _merge_totals(totals, batch)
+        if complete:
+            return equity_result(totals, exact=True)
+        error = _standard_error(totals)
+        if error <= target_error:
+            break
+    return equity_result(totals, exact=False, error=error)
+
+
+def exact_equity(hands, board=(), dead=(), deck=None):
+    """Win/tie equity for each hand over every possible board runout
+
+    Takes the same arguments as monte_carlo_equity (plus an optional
+    explicit deck of unseen card codes) and returns the same structure.
+    Board keys are built once per runout and each hand only adds its
+    precomputed hole card keys, so the turn and river cost a few
+    milliseconds even ten-handed.
+    """
+    hands = [list(hand) for hand in hands]
+    board = list(board)
+    if deck is None:
+        deck = remaining_deck(hands, board, dead)
+    board_rank, board_suit, board_mask = hand_keys(board)
+    hole_keys = [hand_keys(hand) for hand in hands]
+    totals = _new_totals(len(hands))
+
+    for runout in combinations(deck, 5 - len(board)):
+        rank_key, suit_key, mask = board_rank, board_suit, board_mask
+        for code in runout:
+            rank_key += RANK_KEY[code]
+            suit_key += SUIT_KEY[code]
+            mask |= CARD_BIT[code]
+        scores = [lookup(rank_key + hole_rank, suit_key + hole_suit, mask | hole_mask)
+                  for hole_rank, hole_suit, hole_mask in hole_keys]
+        _add_showdown(totals, scores)
+    return equity_result(totals, exact=True)
+
+
+def calc_equity(hands, board=(), dead=(), **kwargs):
+    """Exact equity from the flop on, Monte Carlo before it"""
+    if 5 - len(board) <= EXACT_MAX_TO_COME:
+        return exact_equity(hands, board, dead)
+    return monte_carlo_equity(hands, board, dead, **kwargs)
@@ -0,0 +1,181 @@
+from card import card_code
+
+# Hand categories, same numbering calc_hand has always used
+HIGH_CARD = 1
+PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+# A score is the category in the top bits followed by up to five
+# 4-bit ranks in order of significance, so plain int comparison
+# orders hands correctly.
+CATEGORY_SHIFT = 20
+
+# Per-card contributions, indexed by card code (0-51).
+# RANK_KEY packs a 3-bit count per rank, SUIT_KEY a 4-bit count per
+# suit and CARD_BIT sets one bit in a 13-bit rank mask per suit.
+# Keys are additive, so a partial board key plus hole card keys is
+# the key of the whole hand.
+RANK_KEY = [1 << (3 * (code // 4)) for code in range(52)]
+SUIT_KEY = [1 << (4 * (code % 4)) for code in range(52)]
+CARD_BIT = [1 << (13 * (code % 4) + code // 4) for code in range(52)]
+
+# Adding 3 to a suit nibble sets its high bit once the count reaches 5
+FLUSH_CHECK_ADD = 0x3333
+FLUSH_CHECK_MASK = 0x8888
+FLUSH_SHIFT = {0x8: 0, 0x80: 13, 0x800: 26, 0x8000: 39}
+
+# The ten straights as 13-bit rank masks, best first (wheel last)
+STRAIGHTS = [(0x1F << low, low + 6) for low in range(8, -1, -1)] + [(0x100F, 5)]
+
+
+def pack(category, ranks=()):
+    score = category
+    for i in range(5):
+        score = (score << 4) | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+
+def hand_category(score):
+    """Return the 1-10 hand category of a packed score"""
+    return score >> CATEGORY_SHIFT
+
+
+def unpack(score):
+    """Return a packed score as [category, rank, rank, ...]"""
+    ranks = [(score >> (16 - 4 * i)) & 0xF for i in range(5)]
+    return [hand_category(score)] + [r for r in ranks if r]
+
+
+def _straight_high(rank_mask):
+    for straight, high in STRAIGHTS:
+        if rank_mask & straight == straight:
+            return high
+    return 0
+
+
+def _top_ranks(rank_mask, n):
+    ranks = []
+    for rank in range(14, 1, -1):
+        if rank_mask & (1 << (rank - 2)):
+            ranks.append(rank)
+            if len(ranks) == n:
+                break
+    return ranks
+
+
+def _score_flush(rank_mask):
+    high = _straight_high(rank_mask)
+    if high == 14:
+        return pack(ROYAL_FLUSH, [14])
+    if high:
+        return pack(STRAIGHT_FLUSH, [high])
+    return pack(FLUSH, _top_ranks(rank_mask, 5))
+
+
+def _score_counts(counts):
+    # counts[i] is how many cards of rank i + 2 the hand holds
+    by_count = {4: [], 3: [], 2: [], 1: []}
+    rank_mask = 0
+    for i in range(12, -1, -1):
+        if counts[i]:
+            by_count[counts[i]].append(i + 2)
+            rank_mask |= 1 << i
+    quads, trips, pairs, singles = by_count[4], by_count[3], by_count[2], by_count[1]
+
+    if quads:
+        kicker = max(r for r in range(2, 15) if counts[r - 2] and r != quads[0])
+        return pack(FOUR_OF_A_KIND, [quads[0], kicker])
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return pack(FULL_HOUSE, [trips[0], pair])
+    high = _straight_high(rank_mask)
+    if high:
+        return pack(STRAIGHT, [high])
+    if trips:
+        return pack(THREE_OF_A_KIND, [trips[0]] + singles[:2])
+    if len(pairs) >= 2:
+        kicker = max(pairs[2:] + singles)
+        return pack(TWO_PAIR, [pairs[0], pairs[1], kicker])
+    if pairs:
+        return pack(PAIR, [pairs[0]] + singles[:3])
+    return pack(HIGH_CARD, singles[:5])
+
+
+def _build_flush_table():
+    table = [0] * 8192
+    for rank_mask in range(8192):
+        if bin(rank_mask).count("1") >= 5:
+            table[rank_mask] = _score_flush(rank_mask)
+    return table
+
+
+def _build_rank_table():
+    table = {}
+    counts = [0] * 13
+
+    def fill(index, left, key):
+        if index == 13:
+            if left == 0:
+                table[key] = _score_counts(counts)
+            return
+        for count in range(min(4, left) + 1):
+            counts[index] = count
+            fill(index + 1, left - count, key + (count << (3 * index)))
+        counts[index] = 0
+
+    for n in (5, 6, 7):
+        fill(0, n, 0)
+    return table
+
+
+# Best flush or straight flush for a 13-bit rank mask of one suit
+FLUSH_TABLE = _build_flush_table()
+# Best non-flush hand for every 5, 6 and 7 card rank multiset
+RANK_TABLE = _build_rank_table()
+
+
+def lookup(rank_key, suit_key, mask):
+    """Score a hand from its accumulated keys"""
+    flush = (suit_key + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush:
+        return FLUSH_TABLE[(mask >> FLUSH_SHIFT[flush]) & 0x1FFF]
+    return RANK_TABLE[rank_key]
+
+
+def hand_keys(codes):
+    """Accumulate (rank_key, suit_key, mask) for any number of card codes"""
+    rank_key = suit_key = mask = 0
+    for code in codes:
+        rank_key += RANK_KEY[code]
+        suit_key += SUIT_KEY[code]
+        mask |= CARD_BIT[code]
+    return rank_key, suit_key, mask
+
+
+def evaluate(codes):
+    """Score 5 to 7 card codes, higher is better"""
+    return lookup(*hand_keys(codes))
+
+
+def card_codes(cards):
+    """Convert card dicts or Card objects to card codes"""
+    codes = []
+    for card in cards:
+        if isinstance(card, dict):
+            codes.append(card_code(card["suit"], card["rank"]))
+        else:
+            codes.append(card.code)
+    return codes
+
+
+def evaluate_cards(cards):
+    """Score card dicts or Card objects"""
+    return evaluate(card_codes(cards))
+
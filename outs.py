@@ -0,0 +1,71 @@
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from evaluator import (RANK_KEY, SUIT_KEY, CARD_BIT, HIGH_CARD, PAIR, TWO_PAIR,
+                       THREE_OF_A_KIND, FOUR_OF_A_KIND, hand_keys, lookup, hand_category)
+from equity import remaining_deck
+
+
+def _category_with(keys, codes):
+    rank_key, suit_key, mask = keys
+    for code in codes:
+        rank_key += RANK_KEY[code]
+        suit_key += SUIT_KEY[code]
+        mask |= CARD_BIT[code]
+    return hand_category(lookup(rank_key, suit_key, mask))
+
+
+def _board_category(board, keys, codes):
+    # Category of the board alone with codes added. The evaluator needs
+    # five cards, fewer can only make pairs, trips or quads.
+    if len(board) + len(codes) >= 5:
+        return _category_with(keys, codes)
+    counts = sorted(Counter(code // 4 for code in board + codes).values(), reverse=True)
+    if counts[0] == 4:
+        return FOUR_OF_A_KIND
+    if counts[0] == 3:
+        return THREE_OF_A_KIND
+    if counts[0] == 2:
+        return TWO_PAIR if counts[1] == 2 else PAIR
+    return HIGH_CARD
+
+
+@lru_cache(maxsize=4096)
+def _calc_outs(hole, board):
+    keys = hand_keys(hole + board)
+    board_keys = hand_keys(board)
+    current = hand_category(lookup(*keys))
+    board_now = _board_category(board, board_keys, ())
+    unseen = remaining_deck([hole], board)
+
+    def improves(codes):
+        # Only what the hole cards gain over the board counts, a card that
+        # pairs the board lifts every player the same
+        better = _category_with(keys, codes)
+        return better > current and better - current > _board_category(board, board_keys, codes) - board_now
+
+    outs = [code for code in unseen if improves((code,))]
+    if len(board) == 4:
+        hits, runouts = len(outs), len(unseen)
+    else:
+        # Flop: count every turn and river pair that ends up better
+        runouts = hits = 0
+        for runout in combinations(unseen, 5 - len(board)):
+            runouts += 1
+            if improves(runout):
+                hits += 1
+    return current, tuple(outs), hits / runouts
+
+
+def calc_outs(hole, board):
+    """Outs for one player on the flop or turn
+
+    hole and board are card codes, and only what that player can see is
+    used. Returns the current hand category, the unseen cards that
+    improve it on the next card by more than they improve the board
+    alone, and the chance of such an improvement by the river. Results are cached per (hole, board), so re-sending them on a
+    reconnect costs nothing.
+    """
+    if len(board) not in (3, 4):
+        raise ValueError("outs are only defined on the flop and turn")
+    return _calc_outs(tuple(sorted(hole)), tuple(sorted(board)))
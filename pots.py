@@ -0,0 +1,73 @@
+def build_pots(contributions, folded=()):
+    """Main pot and side pots from what every player put in this hand
+
+    contributions maps player key -> chips put in over the whole hand,
+    folded players included: their chips stay in the pots they reached
+    but they can't win any. One sort, then one sweep over the distinct
+    amounts live players put in, each of which caps a pot. Returns
+    [{"amount", "players"}], main pot first, players in contribution
+    order.
+    """
+    order = sorted(contributions.items(), key=lambda item: item[1])
+    pots = []
+    previous = 0
+    start = 0  # first player who put in more than `previous`
+    for i, (key, level) in enumerate(order):
+        if key in folded or level <= previous:
+            continue
+        # Everyone from `start` on pays into this pot, up to `level`
+        amount = 0
+        while order[start][1] < level:
+            amount += order[start][1] - previous
+            start += 1
+        amount += (level - previous) * (len(order) - start)
+        pots.append({
+            "amount": amount,
+            "players": [k for k, _ in order[start:] if k not in folded],
+        })
+        previous = level
+
+    # Folded chips above the biggest live contribution go in the last pot
+    for _, contribution in order[start:]:
+        if contribution > previous and pots:
+            pots[-1]["amount"] += contribution - previous
+    return pots
+
+
+class ContributionLedger:
+    """Chips each player put in this hand, across every street
+
+    Blinds, calls and raises are added as they happen and folds are
+    marked, so the pot structure is known at any point of the hand. It
+    is built once after each change and kept until the next one.
+    """
+    __slots__ = ("contributions", "folded", "total", "_pots")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Empty ledger for a new hand"""
+        self.contributions = {}
+        self.folded = set()
+        self.total = 0
+        self._pots = []
+
+    def add(self, key, amount):
+        if amount:
+            self.contributions[key] = self.contributions.get(key, 0) + amount
+            self.total += amount
+            self._pots = None
+
+    def fold(self, key):
+        self.folded.add(key)
+        self._pots = None
+
+    def contributed(self, key):
+        return self.contributions.get(key, 0)
+
+    def pots(self):
+        """The current main pot and side pots, see build_pots"""
+        if self._pots is None:
+            self._pots = build_pots(self.contributions, self.folded)
+        return self._pots
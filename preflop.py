@@ -0,0 +1,171 @@
+import mmap
+import os
+import struct
+import sys
+
+# The 169 canonical starting hands live on a 13x13 grid, aces first:
+# pairs on the diagonal, suited hands above it, offsuit hands below.
+RANK_CHARS = "AKQJT98765432"
+HAND_CLASSES = 169
+MAX_PLAYERS = 10
+
+PREFLOP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.bin")
+
+# File layout: header, then a 169x169 heads-up matrix (hero row vs
+# villain column), then a 169x9 matrix of equity against 1-9 random
+# hands. Equities are little-endian uint16 scaled by EQUITY_SCALE.
+MAGIC = b"PFEQ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH")
+EQUITY = struct.Struct("<H")
+EQUITY_SCALE = 65535
+HEADS_UP_OFFSET = HEADER.size
+MULTIWAY_OFFSET = HEADS_UP_OFFSET + HAND_CLASSES * HAND_CLASSES * EQUITY.size
+FILE_SIZE = MULTIWAY_OFFSET + HAND_CLASSES * (MAX_PLAYERS - 1) * EQUITY.size
+
+
+def hand_class(codes):
+    """Canonical 0-168 index of a two card code hand"""
+    first, second = codes
+    # card code // 4 is rank - 2, so 12 - that puts aces at row 0
+    high, low = sorted((12 - first // 4, 12 - second // 4))
+    if first % 4 == second % 4:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class_name(index):
+    """Human readable name of a hand class, e.g. 'AKs', 'T9o', '77'"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_CHARS[row] * 2
+    if row < col:
+        return RANK_CHARS[row] + RANK_CHARS[col] + "s"
+    return RANK_CHARS[col] + RANK_CHARS[row] + "o"
+
+
+class PreflopTable:
+    """Read-only view of the preflop equity file, memory-mapped"""
+
+    def __init__(self, path=PREFLOP_TABLE_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, classes, max_players = HEADER.unpack_from(self._map, 0)
+        if (magic, version, classes, max_players) != (MAGIC, VERSION, HAND_CLASSES, MAX_PLAYERS) \
+                or len(self._map) != FILE_SIZE:
+            self._map.close()
+            raise ValueError(f"{path} is not a preflop equity table")
+
+    def heads_up(self, hero, villain):
+        """Equity of hand class `hero` against hand class `villain`"""
+        offset = HEADS_UP_OFFSET + (hero * HAND_CLASSES + villain) * EQUITY.size
+        return EQUITY.unpack_from(self._map, offset)[0] / EQUITY_SCALE
+
+    def multiway(self, hero, players):
+        """Equity of hand class `hero` against players - 1 random hands"""
+        offset = MULTIWAY_OFFSET + (hero * (MAX_PLAYERS - 1) + players - 2) * EQUITY.size
+        return EQUITY.unpack_from(self._map, offset)[0] / EQUITY_SCALE
+
+    def close(self):
+        self._map.close()
+
+
+def load_preflop_table(path=PREFLOP_TABLE_PATH):
+    """Map the shipped table, or return None if it has not been built"""
+    try:
+        return PreflopTable(path)
+    except (OSError, ValueError) as e:
+        print(f"Preflop equity table unavailable: {e}")
+        return None
+
+
+def class_combos():
+    """The concrete two card combos of each hand class"""
+    combos = [[] for _ in range(HAND_CLASSES)]
+    for first in range(52):
+        for second in range(first + 1, 52):
+            combos[hand_class((first, second))].append((first, second))
+    return combos
+
+
+def _showdown_shares(hero_scores, other_scores):
+    # Hero's pot share per deal: 1 for a win, 1/k for a k-way tie
+    import numpy as np
+    best = np.maximum(hero_scores, other_scores.max(axis=1))
+    tied = 1 + (other_scores == best[:, None]).sum(axis=1)
+    return np.where(hero_scores == best, 1.0 / tied, 0.0)
+
+
+def _heads_up_row(hero, combos, samples, rng):
+    import numpy as np
+    from batch_evaluator import evaluate_batch
+
+    hero_combos = np.array(combos[hero])
+    row = np.zeros(HAND_CLASSES)
+    for villain in range(HAND_CLASSES):
+        villain_combos = np.array(combos[villain])
+        hero_cards = hero_combos[rng.integers(len(hero_combos), size=samples)]
+        villain_cards = villain_combos[rng.integers(len(villain_combos), size=samples)]
+        # Redraw villain hands that share a card with hero's
+        while True:
+            clash = (villain_cards[:, :, None] == hero_cards[:, None, :]).any(axis=(1, 2))
+            if not clash.any():
+                break
+            villain_cards[clash] = villain_combos[rng.integers(len(villain_combos), size=clash.sum())]
+
+        keys = rng.random((samples, 52))
+        np.put_along_axis(keys, hero_cards, 2.0, axis=1)
+        np.put_along_axis(keys, villain_cards, 2.0, axis=1)
+        board = np.argpartition(keys, 5, axis=1)[:, :5]
+
+        hero_scores = evaluate_batch(np.hstack([hero_cards, board]))
+        villain_scores = evaluate_batch(np.hstack([villain_cards, board]))
+        row[villain] = _showdown_shares(hero_scores, villain_scores[:, None]).mean()
+    return row
+
+
+def _multiway_row(hero, combos, samples, rng):
+    import numpy as np
+    from batch_evaluator import evaluate_batch
+
+    hero_combos = np.array(combos[hero])
+    row = np.zeros(MAX_PLAYERS - 1)
+    for players in range(2, MAX_PLAYERS + 1):
+        hero_cards = hero_combos[rng.integers(len(hero_combos), size=samples)]
+        keys = rng.random((samples, 52))
+        np.put_along_axis(keys, hero_cards, 2.0, axis=1)
+        deal = np.argsort(keys, axis=1)
+        opponents = players - 1
+        board = deal[:, 2 * opponents:2 * opponents + 5]
+
+        hero_scores = evaluate_batch(np.hstack([hero_cards, board]))
+        other_scores = np.column_stack([
+            evaluate_batch(np.hstack([deal[:, 2 * i:2 * i + 2], board])) for i in range(opponents)
+        ])
+        row[players - 2] = _showdown_shares(hero_scores, other_scores).mean()
+    return row
+
+
+def build_preflop_table(path=PREFLOP_TABLE_PATH, samples=4000, multiway_samples=50000, seed=0):
+    """Estimate every equity with the batch evaluator and write the file"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    combos = class_combos()
+    heads_up = np.array([_heads_up_row(hero, combos, samples, rng) for hero in range(HAND_CLASSES)])
+    # Average each matchup with its mirror so hero + villain sums to 1
+    heads_up = (heads_up + 1 - heads_up.T) / 2
+    multiway = np.array([_multiway_row(hero, combos, multiway_samples, rng) for hero in range(HAND_CLASSES)])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, HAND_CLASSES, MAX_PLAYERS))
+        for table in (heads_up, multiway):
+            f.write(np.round(table * EQUITY_SCALE).astype("<u2").tobytes())
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    # python preflop.py [heads-up samples] [multiway samples]
+    args = [int(arg) for arg in sys.argv[1:3]]
+    build_preflop_table(*([PREFLOP_TABLE_PATH] + args))
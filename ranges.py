@@ -0,0 +1,219 @@
+import os
+from collections import Counter, defaultdict
+from itertools import combinations
+import numpy as np
+from batch_evaluator import evaluate_batch
+from equity import EXACT_MAX_TO_COME
+from preflop import HAND_CLASSES, class_combos, hand_class, hand_class_name
+
+DEFAULT_SAMPLES = 20000
+MAX_CACHED_BOARDS = 16
+
+# Per-board partial results: the runouts of the board and each combo's
+# score on every runout, so a board is only ever scored once per combo
+_board_cache = {}
+
+
+CLASS_COMBOS = class_combos()
+COMBOS = [combo for combos in CLASS_COMBOS for combo in combos]
+COMBO_INDEX = {combo: i for i, combo in enumerate(COMBOS)}
+COMBO_CLASS = np.array([hand_class(combo) for combo in COMBOS], dtype=np.intp)
+
+# Preflop class against class equities laid out per combo pair, with
+# pairs that share a card zeroed, built once per preflop table
+_preflop_cache = {}
+
+
+def expand_range(hand_range):
+    """Turn {hand class or (code, code): weight} into {combo: weight}"""
+    combos = defaultdict(float)
+    for key, weight in hand_range.items():
+        if isinstance(key, int):
+            for combo in CLASS_COMBOS[key]:
+                combos[combo] += weight
+        else:
+            combos[tuple(sorted(key))] += weight
+    return dict(combos)
+
+
+def vpip_range(player_data):
+    """Hand classes a player voluntarily played, weighted by how often"""
+    counts = Counter()
+    for hand_data in player_data['hands'].values():
+        preflop_actions = hand_data['betting_rounds']['pre-flop']['actions']
+        if hand_data['hole_cards'] and any(a['action'] in ['call', 'raise'] for a in preflop_actions):
+            counts[hand_class(hand_data['hole_cards'])] += 1
+    return dict(counts)
+
+
+def _preflop_matrix(preflop):
+    matrix = _preflop_cache.get(id(preflop))
+    if matrix is None:
+        classes = np.array([[preflop.heads_up(hero, villain) for villain in range(HAND_CLASSES)]
+                            for hero in range(HAND_CLASSES)])
+        cards = np.array(COMBOS, dtype=np.intp)
+        blocked = (cards[:, None, :, None] == cards[None, :, None, :]).any(axis=(2, 3))
+        matrix = np.where(blocked, 0.0, classes[COMBO_CLASS][:, COMBO_CLASS])
+        _preflop_cache.clear()
+        _preflop_cache[id(preflop)] = matrix = (matrix, ~blocked)
+    return matrix
+
+
+def _preflop_range_equity(a, b, preflop):
+    # Every combo pair weighted by both ranges, equities from the table
+    equities, compatible = _preflop_matrix(preflop)
+    a_weights = np.zeros(len(COMBOS))
+    b_weights = np.zeros(len(COMBOS))
+    for combo, weight in a.items():
+        a_weights[COMBO_INDEX[combo]] = weight
+    for combo, weight in b.items():
+        b_weights[COMBO_INDEX[combo]] = weight
+    pair_weight = a_weights * (compatible @ b_weights)
+    pair_share = a_weights * (equities @ b_weights)
+    total = pair_weight.sum()
+    if not total:
+        raise ValueError("the ranges have no combos that can be dealt together")
+
+    class_weight = np.bincount(COMBO_CLASS, pair_weight, HAND_CLASSES)
+    class_share = np.bincount(COMBO_CLASS, pair_share, HAND_CLASSES)
+    equity = float(pair_share.sum() / total)
+    return {
+        # The table only has equity, ties are already split into it
+        "players": [
+            {"win": None, "tie": None, "equity": equity},
+            {"win": None, "tie": None, "equity": 1 - equity},
+        ],
+        "samples": 0,
+        "exact": True,
+        "error": 0.0,
+        "hands": {hand_class_name(index): float(class_share[index] / class_weight[index])
+                  for index in np.nonzero(class_weight)[0]},
+    }
+
+
+def _board_entry(board, samples, seed):
+    key = (board, samples, seed)
+    entry = _board_cache.get(key)
+    if entry is not None:
+        return entry
+
+    deck = np.array([code for code in range(52) if code not in board], dtype=np.intp)
+    to_come = 5 - len(board)
+    if to_come <= EXACT_MAX_TO_COME:
+        runouts = np.array(list(combinations(deck, to_come)), dtype=np.intp).reshape(-1, to_come)
+    else:
+        rng = np.random.default_rng(seed)
+        runouts = deck[np.argsort(rng.random((samples, len(deck))), axis=1)[:, :to_come]]
+    boards = np.hstack([np.tile(np.array(board, dtype=np.intp), (len(runouts), 1)), runouts])
+    # present[r, c] is True when card c comes on runout r
+    present = np.zeros((len(runouts), 52), dtype=bool)
+    np.put_along_axis(present, runouts, True, axis=1)
+
+    if len(_board_cache) >= MAX_CACHED_BOARDS:
+        _board_cache.pop(next(iter(_board_cache)))
+    entry = _board_cache[key] = {
+        "boards": boards,
+        "present": present,
+        "exact": to_come <= EXACT_MAX_TO_COME,
+        "scores": {},
+    }
+    return entry
+
+
+def _combo_scores(entry, combos):
+    # Score the combos this board has not seen yet in one batch
+    missing = [combo for combo in combos if combo not in entry["scores"]]
+    if missing:
+        boards, present = entry["boards"], entry["present"]
+        cards = np.array(missing, dtype=np.intp)
+        # Runouts that reuse a hole card can't be scored, they stay at -1
+        # and are masked out again in _range_rows
+        live = ~(present[:, cards[:, 0]] | present[:, cards[:, 1]]).T
+        combo_index, runout_index = np.nonzero(live)
+        scores = np.full(live.shape, -1, dtype=np.int64)
+        scores[combo_index, runout_index] = evaluate_batch(
+            np.hstack([cards[combo_index], boards[runout_index]]))
+        for combo, row in zip(missing, scores):
+            entry["scores"][combo] = row
+    return np.array([entry["scores"][combo] for combo in combos])
+
+
+def _range_rows(a_combos, a_scores, b_combos, b_scores, b_weights, present):
+    """Weighted win/tie/equity sums of each combo in A against all of B"""
+    b_cards = np.array(b_combos, dtype=np.intp)
+    b_live = ~(present[:, b_cards[:, 0]] | present[:, b_cards[:, 1]]).T
+    rows = []
+    for (a1, a2), scores in zip(a_combos, a_scores):
+        # Drop B combos that share a card with this combo, and runouts
+        # that use a card from either hand
+        weights = np.where((b_cards == a1).any(axis=1) | (b_cards == a2).any(axis=1), 0.0, b_weights)
+        valid = b_live & ~(present[:, a1] | present[:, a2])
+        counts = np.maximum(valid.sum(axis=1), 1)
+        wins = ((scores > b_scores) & valid).sum(axis=1) / counts
+        ties = ((scores == b_scores) & valid).sum(axis=1) / counts
+        rows.append((weights.sum(), weights @ wins, weights @ ties))
+    return rows
+
+
+def range_equity(range_a, range_b, board=(), samples=DEFAULT_SAMPLES, seed=0, executor=None, preflop=None):
+    """Equity of weighted range A against weighted range B on a board
+
+    Ranges map hand classes (0-168) or explicit (code, code) combos to
+    weights. Combos that collide with the board, with each other or with
+    a runout are left out. From the flop on every runout is enumerated.
+    Without a board the class equities of `preflop` (a PreflopTable) are
+    used when it is given, which only have the equity, win and tie are
+    None. Otherwise `samples` seeded runouts are dealt. Rows of the combo
+    matrix are split across `executor` (e.g. a ProcessPoolExecutor) when
+    one is given. Returns the same structure as the equity engines, plus
+    A's equity per hand class under "hands".
+    """
+    board = tuple(sorted(board))
+    blocked = set(board)
+    a = {combo: w for combo, w in expand_range(range_a).items() if w > 0 and not blocked & set(combo)}
+    b = {combo: w for combo, w in expand_range(range_b).items() if w > 0 and not blocked & set(combo)}
+    if not a or not b:
+        raise ValueError("both ranges need at least one combo that fits the board")
+    if not board and preflop is not None:
+        return _preflop_range_equity(a, b, preflop)
+
+    entry = _board_entry(board, samples, seed)
+    a_combos, b_combos = list(a), list(b)
+    a_scores = _combo_scores(entry, a_combos)
+    b_scores = _combo_scores(entry, b_combos)
+    b_weights = np.array([b[combo] for combo in b_combos])
+
+    if executor is None:
+        rows = _range_rows(a_combos, a_scores, b_combos, b_scores, b_weights, entry["present"])
+    else:
+        chunk = -(-len(a_combos) // (os.cpu_count() or 1))
+        futures = [executor.submit(_range_rows, a_combos[i:i + chunk], a_scores[i:i + chunk],
+                                   b_combos, b_scores, b_weights, entry["present"])
+                   for i in range(0, len(a_combos), chunk)]
+        rows = [row for future in futures for row in future.result()]
+
+    total = win = tie = 0.0
+    by_class = defaultdict(lambda: [0.0, 0.0])
+    for combo, (pair_weight, pair_win, pair_tie) in zip(a_combos, rows):
+        weight = a[combo]
+        total += weight * pair_weight
+        win += weight * pair_win
+        tie += weight * pair_tie
+        if pair_weight:
+            class_totals = by_class[hand_class(combo)]
+            class_totals[0] += weight * pair_weight
+            class_totals[1] += weight * (pair_win + pair_tie / 2)
+    if not total:
+        raise ValueError("the ranges have no combos that can be dealt together")
+
+    win, tie = float(win / total), float(tie / total)
+    return {
+        "players": [
+            {"win": win, "tie": tie, "equity": win + tie / 2},
+            {"win": 1 - win - tie, "tie": tie, "equity": 1 - win - tie / 2},
+        ],
+        "samples": len(entry["boards"]),
+        "exact": entry["exact"],
+        "error": 0.0,
+        "hands": {hand_class_name(index): float(share / weight) for index, (weight, share) in by_class.items()},
+    }
@@ -0,0 +1,40 @@
+def rank_players(scores, seat_order):
+    """Order live players best hand first
+
+    scores maps player key -> packed hand score, seat_order lists player
+    keys starting left of the dealer. Equal hands stay in seat order,
+    which is the order odd chips are handed out in.
+    """
+    seats = {key: i for i, key in enumerate(seat_order)}
+    return sorted(scores, key=lambda key: (-scores[key], seats[key]))
+
+
+def award_pots(pots, scores, ranking):
+    """Split every pot among its best eligible hands in one pass
+
+    pots is a list of {"amount", "players"} as built by create_pots,
+    ranking comes from rank_players. Returns one award dict per winner
+    per pot. A pot that doesn't divide evenly gives its odd chips one at
+    a time to the winners earliest in seat order.
+    """
+    awards = []
+    for pot_index, pot in enumerate(pots):
+        eligible = set(pot["players"])
+        winners = []
+        for key in ranking:
+            if key not in eligible:
+                continue
+            if winners and scores[key] != scores[winners[0]]:
+                break
+            winners.append(key)
+        if not winners:
+            continue
+
+        share, odd = divmod(pot["amount"], len(winners))
+        for i, key in enumerate(winners):
+            awards.append({
+                "pot_index": pot_index,
+                "player": key,
+                "amount": share + min(1, max(odd - i, 0)),
+            })
+    return awards
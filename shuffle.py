@@ -0,0 +1,135 @@
+import hashlib
+import random
+import secrets
+from collections import deque
+from deck import DECK_SIZE
+
+DEFAULT_POOL_SIZE = 256
+SALT_BYTES = 16
+
+
+def shuffled_order(rng):
+    """A full Fisher-Yates permutation of the 52 card codes"""
+    order = bytearray(range(DECK_SIZE))
+    for i in range(DECK_SIZE - 1):
+        j = rng.randrange(i, DECK_SIZE)
+        order[i], order[j] = order[j], order[i]
+    return order
+
+
+def commitment(salt, order):
+    """Hex digest published for a deck order before any card is dealt
+
+    The per-hand salt keeps the digest from being matched against guessed
+    orders. Once the hand is over anyone given the salt and the order can
+    recompute it.
+    """
+    return hashlib.sha256(bytes(salt) + bytes(order)).hexdigest()
+
+
+def verify_commitment(record):
+    """True if a finished hand's salt and order match its commitment"""
+    return commitment(bytes.fromhex(record["salt"]), bytes.fromhex(record["order"])) == record["commitment"]
+
+
+class SystemShuffle:
+    """Production shuffles drawn from the OS CSPRNG
+
+    The whole order is fixed when the hand starts so the hand history can
+    record a commitment to it. The salt and the order are kept under
+    "reveal" in the record, the engine moves them into the record once the
+    hand is over.
+    """
+    mode = "system"
+
+    def __init__(self):
+        self._rng = random.SystemRandom()
+
+    def _next_order(self):
+        return shuffled_order(self._rng)
+
+    def start_hand(self, deck, hand_key):
+        order = self._next_order()
+        deck.load(order)
+        salt = secrets.token_bytes(SALT_BYTES)
+        return {
+            "mode": self.mode,
+            "commitment": commitment(salt, order),
+            "reveal": {"salt": salt.hex(), "order": bytes(order).hex()},
+        }
+
+
+class PooledShuffle(SystemShuffle):
+    """CSPRNG shuffles generated ahead of time off the event loop
+
+    Built for the eventlet server, which is not monkey-patched. When the
+    pool drops to half, one green thread hands a batch to eventlet.tpool,
+    which runs it on a native worker thread while the hub keeps serving.
+    The green thread adds the batch to the pool when tpool returns, so
+    the pool is only ever touched from the hub. Dealing never waits on a
+    refill, it shuffles inline if the pool has run dry.
+    """
+    mode = "pool"
+
+    def __init__(self, size=DEFAULT_POOL_SIZE):
+        import eventlet
+        super().__init__()
+        self._spawn = eventlet.spawn
+        self._size = size
+        self._pool = deque()
+        self._filling = False
+        # Separate generator so the dealing side never shares one
+        self._fill_rng = random.SystemRandom()
+        self._refill()
+
+    def _refill(self):
+        if not self._filling:
+            self._filling = True
+            self._spawn(self._fill)
+
+    def _fill(self):
+        from eventlet import tpool
+        try:
+            count = self._size - len(self._pool)
+            self._pool.extend(tpool.execute(_shuffled_orders, self._fill_rng, count))
+        finally:
+            self._filling = False
+
+    def _next_order(self):
+        if len(self._pool) <= self._size // 2:
+            self._refill()
+        if self._pool:
+            return self._pool.popleft()
+        return super()._next_order()
+
+
+def _shuffled_orders(rng, count):
+    return [shuffled_order(rng) for _ in range(count)]
+
+
+class SeededShuffle:
+    """Reproducible shuffles, one seed per hand derived from a table seed
+
+    Replaying a hand only needs the seed recorded in its history.
+    """
+    mode = "seeded"
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def start_hand(self, deck, hand_key):
+        seed = f"{self.seed}:{hand_key}"
+        deck.load(range(DECK_SIZE), random.Random(seed))
+        return {"mode": self.mode, "seed": seed}
+
+
+def make_shuffle_source(spec):
+    """'system', 'pool' or 'seeded:<seed>' to a shuffle source"""
+    mode, _, seed = spec.partition(":")
+    if mode == "system":
+        return SystemShuffle()
+    if mode == "pool":
+        return PooledShuffle()
+    if mode == "seeded":
+        return SeededShuffle(seed)
+    raise ValueError(f"unknown shuffle mode {spec!r}")
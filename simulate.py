@@ -0,0 +1,150 @@
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from chips import ChipError
+from engine import calc_hand
+from evaluator import hand_category
+from player import Player
+from preflop import hand_class
+from shuffle import SeededShuffle
+from texasholdemgame import TexasHoldemGame
+
+
+# Strategies get the table and their seat and return (action, raise amount).
+# They have to be module level functions so worker processes can find them.
+
+def to_call(table, seat):
+    return table.current_highest_bet - seat.current_bet
+
+
+def calling_station(table, seat):
+    """Never folds, never raises"""
+    return ("call", 0) if to_call(table, seat) > 0 else ("check", 0)
+
+
+def random_player(table, seat):
+    """Any legal action, raises of one to five big blinds"""
+    if to_call(table, seat) > 0:
+        action = random.choice(["fold", "call", "call", "raise"])
+    else:
+        action = random.choice(["check", "check", "raise"])
+    return action, table.big_blind * random.randint(1, 5)
+
+
+def tight_aggressive(table, seat):
+    """Raises good starting hands and made hands, folds the rest to a bet"""
+    if table.board_shown:
+        strong = hand_category(calc_hand(table.community_cards[:table.board_shown], seat.holecards)) >= 3
+    else:
+        # Row and column of the 13x13 hand class grid, aces at 0
+        row, col = divmod(hand_class(seat.holecards), 13)
+        strong = (row == col and row <= 7) or max(row, col) <= 3
+    if strong:
+        return "raise", max(table.big_blind * 3, table.active_pot // 2)
+    return ("fold", 0) if to_call(table, seat) > 0 else ("check", 0)
+
+
+STRATEGIES = {
+    "call": calling_station,
+    "random": random_player,
+    "tight": tight_aggressive,
+}
+
+
+def _run_batch(args):
+    # One worker's share: play `hands` hands at one table and add up
+    # each strategy's results. Busted seats buy back in.
+    names, hands, seed, buy_in, small_blind, big_blind = args
+    random.seed(seed)
+    players = [Player(f"{name}{i}", buy_in, i + 1, None) for i, name in enumerate(names)]
+    strategies = {player.number: STRATEGIES[name] for player, name in zip(players, names)}
+    game = TexasHoldemGame(players, SeededShuffle(seed), small_blind, big_blind,
+                           strategies=strategies, verbose=False)
+    table = game.table
+
+    results = {name: {"hands": 0, "buy_ins": 0, "chips": 0, "won": 0} for name in names}
+    for seat, name in zip(table.seats, names):
+        results[name]["buy_ins"] += buy_in
+    violations = []
+    played = 0
+    while played < hands:
+        for seat, name in zip(table.seats, names):
+            if seat.money == 0:
+                seat.buy_back_amount = buy_in
+                results[name]["buy_ins"] += buy_in
+        before = [seat.money + (seat.buy_back_amount or 0) for seat in table.seats]
+        try:
+            game.play_game()
+        except ChipError as e:
+            violations.append(f"seed {seed} hand {table.hand}: {e}")
+            break
+        played += 1
+        for seat, name, stack in zip(table.seats, names, before):
+            if seat.holecards:
+                results[name]["hands"] += 1
+                if seat.money > stack:
+                    results[name]["won"] += 1
+    for seat, name in zip(table.seats, names):
+        results[name]["chips"] += seat.money
+    return played, violations, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play hands between strategies on a process pool")
+    parser.add_argument("--hands", type=int, default=100000)
+    parser.add_argument("--strategies", default="tight,random,call,random,tight,call",
+                        help=f"comma separated, one per seat, from {', '.join(STRATEGIES)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=5000, help="hands per table before it is dealt again from a new seed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--buy-in", type=int, default=200)
+    parser.add_argument("--blinds", default="1/2", help="small/big")
+    args = parser.parse_args(argv)
+
+    names = args.strategies.split(",")
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown or len(names) < 2:
+        parser.error(f"need two or more of {', '.join(STRATEGIES)}, got {args.strategies}")
+    small_blind, big_blind = (int(blind) for blind in args.blinds.split("/"))
+
+    batches = []
+    left = args.hands
+    while left > 0:
+        batches.append((names, min(args.batch, left), args.seed + len(batches), args.buy_in, small_blind, big_blind))
+        left -= args.batch
+    print(f"Playing {args.hands:,} hands of {', '.join(names)} in {len(batches)} batches with {args.workers} workers")
+
+    start = time.time()
+    played = 0
+    violations = []
+    totals = defaultdict(lambda: defaultdict(int))
+    with ProcessPoolExecutor(args.workers) as executor:
+        for done, (batch_played, batch_violations, results) in enumerate(executor.map(_run_batch, batches), 1):
+            played += batch_played
+            violations += batch_violations
+            for name, result in results.items():
+                for key, value in result.items():
+                    totals[name][key] += value
+            if done % 10 == 0 or done == len(batches):
+                print(f"  {played:,} hands, {played / (time.time() - start):,.0f} hands/sec")
+
+    elapsed = time.time() - start
+    for violation in violations:
+        print(f"CHIPS {violation}")
+    print(f"{played:,} hands in {elapsed:.1f}s, {played / elapsed:,.0f} hands/sec, "
+          f"{len(violations)} chip conservation violations")
+    for name, total in sorted(totals.items()):
+        net = total["chips"] - total["buy_ins"]
+        per_100 = net / big_blind / total["hands"] * 100 if total["hands"] else 0.0
+        print(f"  {name:8} {total['hands']:>10,} hands dealt  {total['won']:>10,} won  "
+              f"net {net:+,} chips  {per_100:+.1f} bb/100")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+from card import card_dicts, board_dicts
+from deck import Deck
+from betting import BettingRound
+from pots import ContributionLedger
+from chips import ChipBank
+
+# Community cards face up once each street has been dealt
+BOARD_SHOWN = {'pre-flop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+# Seconds a table holds before dealing the next street or the showdown, on
+# the revealed cards, and on the results before the next hand, and how long
+# the page animates each chip to the winners
+PACING = {
+    'normal': {'street': 2, 'reveal': 5, 'results': 5, 'animation': 1},
+    'fast': {'street': 1, 'reveal': 2, 'results': 3, 'animation': 0.5},
+    'turbo': {'street': 0, 'reveal': 0, 'results': 0, 'animation': 0},  # bot tables and load tests
+}
+
+
+class Seat:
+    """One player's place at a web table"""
+    __slots__ = (
+        "id", "name", "number", "avatar", "money", "ready",
+        "holecards", "current_bet", "handscores", "hand_description", "last_action",
+        "has_folded", "has_gone_all_in", "is_out", "sitting_out", "sit_out_next_hand", "buy_back_amount",
+        "time_bank",
+    )
+
+    def __init__(self, id: str, name: str, number: int, money, avatar=None):
+        self.id = id
+        self.name = name
+        self.number = number
+        self.avatar = avatar
+        self.money = money
+        self.ready = False
+        self.holecards = []  # card codes
+        self.current_bet = 0
+        self.handscores = 0
+        self.hand_description = None
+        self.last_action = None
+        self.has_folded = False
+        self.has_gone_all_in = False
+        self.is_out = False
+        self.sitting_out = False
+        self.sit_out_next_hand = False
+        self.buy_back_amount = None
+        self.time_bank = 0  # seconds left to spend past the table's action_time
+
+    def to_dict(self, show_cards=False):
+        # The only place a seat becomes the dict templates and clients see
+        return {
+            "id": self.id,
+            "name": self.name,
+            "number": self.number,
+            "avatar": self.avatar,
+            "money": self.money,
+            "ready": self.ready,
+            "holecards": card_dicts(self.holecards, show_cards),
+            "current_bet": self.current_bet,
+            "handscores": self.handscores,
+            "hand_description": self.hand_description,
+            "last_action": self.last_action,
+            "has_folded": self.has_folded,
+            "has_gone_all_in": self.has_gone_all_in,
+            "is_out": self.is_out,
+            "sitting_out": self.sitting_out,
+            "sit_out_next_hand": self.sit_out_next_hand,
+            "buy_back_amount": self.buy_back_amount,
+            "time_bank": self.time_bank,
+        }
+
+
+class Table:
+    """Settings, seats and hand state of one web game"""
+    __slots__ = (
+        "code", "max_players", "min_players", "time_limit", "chips_per_dollar",
+        "buy_in", "big_blind", "small_blind", "action_time", "time_bank", "pacing",
+        "seats", "seats_by_id", "seats_by_name", "seat_index",
+        "deck", "community_cards", "board_shown", "shuffle", "shuffle_reveal", "hand", "round_stage",
+        "current_player_index", "current_highest_bet", "betting", "betting_round_active", "turn_deadline",
+        "pots", "ledger", "chips", "dealer_position", "small_blind_pos", "big_blind_pos",
+        "first_hand_completed", "time_expired", "extend_votes", "buy_back_votes", "total_voters",
+    )
+
+    def __init__(self, code: str, max_players: int, min_players: int, time_limit: int,
+                 chips_per_dollar: int, buy_in: int, big_blind: int, small_blind: int,
+                 action_time: int = 30, time_bank: int = 60, pacing: str = 'normal'):
+        self.code = code
+        self.max_players = max_players
+        self.min_players = min_players
+        self.time_limit = time_limit
+        self.chips_per_dollar = chips_per_dollar
+        self.buy_in = buy_in
+        self.big_blind = big_blind
+        self.small_blind = small_blind
+        self.action_time = action_time  # seconds each player gets to act
+        self.time_bank = time_bank  # extra seconds each seat can draw on over the game
+        self.pacing = PACING[pacing]
+
+        # Lookups kept in step with seats by add_seat and keep_seats
+        self.seats = []
+        self.seats_by_id = {}
+        self.seats_by_name = {}
+        self.seat_index = {}  # player id -> position in seats
+
+        self.deck = Deck()
+        self.community_cards = []  # card codes
+        self.board_shown = 0  # how many community cards are face up
+        self.shuffle = None  # shuffle record of the current hand
+        self.shuffle_reveal = None  # what the record commits to, published when the hand ends
+        self.hand = 1
+        self.round_stage = 'pre-flop'  # pre-flop, flop, turn, river
+        self.current_player_index = 0
+        self.current_highest_bet = 0
+        self.betting = BettingRound()  # who is to act on the current street
+        self.betting_round_active = True
+        self.turn_deadline = None  # time.time() the current player is folded or checked
+        self.pots = []
+        self.ledger = ContributionLedger()  # chips each player put in this hand
+        self.chips = ChipBank(self.ledger)  # all chip moves, checks nothing leaks
+        self.dealer_position = 0  # Track dealer button position
+        self.small_blind_pos = 1  # Small blind is next after dealer
+        self.big_blind_pos = 2    # Big blind is two after dealer
+        self.first_hand_completed = False
+        self.time_expired = False
+        self.extend_votes = set()     # Votes to extend time
+        self.buy_back_votes = set()   # Votes to buy back in
+        self.total_voters = set()
+
+    def add_seat(self, seat):
+        self.seat_index[seat.id] = len(self.seats)
+        self.seats.append(seat)
+        seat.time_bank = self.time_bank
+        self.seats_by_id[seat.id] = seat
+        self.seats_by_name[seat.name] = seat
+
+    def seat(self, player_id):
+        """The seat of a player id, or None"""
+        return self.seats_by_id.get(player_id)
+
+    def seat_by_name(self, name):
+        return self.seats_by_name.get(name)
+
+    def keep_seats(self, player_ids):
+        """Drop every seat whose player id is not in player_ids"""
+        for seat in self.seats:
+            if seat.id not in player_ids:
+                self.chips.cash_out(seat)
+        self.seats[:] = [seat for seat in self.seats if seat.id in player_ids]
+        self.seats_by_id = {seat.id: seat for seat in self.seats}
+        self.seats_by_name = {seat.name: seat for seat in self.seats}
+        self.seat_index = {seat.id: i for i, seat in enumerate(self.seats)}
+
+    @property
+    def active_pot(self):
+        return self.chips.pot
+
+    def current_seat(self):
+        return self.seats[self.current_player_index]
+
+    def players_view(self, show_cards=False, viewer_id=None):
+        """Seats as dicts, hole cards face up for everyone or just the viewer"""
+        return [seat.to_dict(show_cards or seat.id == viewer_id) for seat in self.seats]
+
+    def board_view(self):
+        """The community cards as dicts, face up as far as the hand has gone"""
+        return board_dicts(self.community_cards, self.board_shown)
@@ -1,322 +1,188 @@
 from deck import Deck
-from collections import Counter
 from player import Player
-from card import Card
+from card import Card, CARDS
+from table import Table, Seat
+from evaluator import evaluate_cards
+from engine import ActionError, start_hand, act, deal_street, reveal, settle, hand_description
 
 class TexasHoldemGame:
-    end_game = False  # class variable shared by all instances
+    """Terminal adapter over engine.py, one Player per seat of a Table
 
-    def __init__(self, players):
+    strategies maps player numbers to callables (table, seat) -> (action,
+    raise amount) that play instead of asking at the terminal, see
+    simulate.py. verbose=False prints nothing.
+    """
+
+    def __init__(self, players, shuffle_source=None, small_blind=1, big_blind=2, strategies=None, verbose=True):
         self.players = players
-        self.deck = Deck()
+        self.shuffle_source = shuffle_source  # see shuffle.py, None uses the random module
+        self.strategies = strategies or {}
+        self.verbose = verbose
+        self.end_game = False
+        self.table = Table("cli", len(players), 2, 0, 1, 0, big_blind, small_blind)
+        for player in players:
+            seat = Seat(str(player.number), player.name, player.number, 0, avatar=player.avatar)
+            self.table.add_seat(seat)
+            self.table.chips.buy_in(seat, int(player.money))
+        self.players_by_seat = {str(player.number): player for player in players}
         self.community_cards = []
-        self.current_highest_bet = 0
         self.pots = []
 
-    def deal_hole_cards(self):
-        # deal 2 hole cards to each player
-        for _ in range(2):
-            for player in self.players:
-                player.receive_card(self.deck.deal_card())
+    @property
+    def deck(self):
+        return self.table.deck
+
+    @property
+    def hand(self):
+        return self.table.hand
+
+    @property
+    def shuffle(self):
+        return self.table.shuffle
+
+    @property
+    def current_highest_bet(self):
+        return self.table.current_highest_bet
 
+    def deal_hole_cards(self):
         # show hole cards to each player
         for player in self.players:
+            if not player.holecards or player.number in self.strategies:
+                continue
             answer = input(f"{player.name}, I will display your hole cards for 5 seconds. Confirm you read this message (y/n): ").strip().lower()
             if answer.startswith('y'):
                 print(f"{player.name} has the following hole cards: {player.holecards}")
                 #time.sleep(5)
                 #print("\033[F\033[K" * 2)
 
-    def deal_flop(self):
-        self.community_cards.extend([self.deck.deal_card() for _ in range(3)])
-
-    def deal_turn(self):
-        self.community_cards.append(self.deck.deal_card())
-
-    def deal_river(self):
-        self.community_cards.append(self.deck.deal_card())
-    
-    def create_pots(self):
-        self.pots = []  # reset pots list
-
-        # Keep going until all remaining bets are zero
+    def choose_action(self, player):
+        """Ask the player's strategy or the terminal, returns (action, raise amount)"""
+        strategy = self.strategies.get(player.number)
+        if strategy:
+            return strategy(self.table, self.table.seat(str(player.number)))
+        action = input(f"\n{player.name}, choose an action (fold, check, call, raise): ").strip().lower()
+        amount = 0
+        if action == "raise":
+            try:
+                amount = int(input("Enter raise amount: "))
+            except ValueError:
+                print("Invalid number. Try again.")
+                return None, 0
+        return action, amount
+
+    def take_turn(self, player_id):
+        # Ask until the engine accepts an action
+        player = self.players_by_seat[player_id]
         while True:
-            # Get all players who still have money in the pot and are eligible
-            active_players = [p for p in self.players if p.currentbet > 0 and (not p.is_out() or p.has_gone_all_in)]
-            if not active_players:
-                break
-
-            # Find minimum contribution among active players
-            min_contribution = min(p.currentbet for p in active_players)
-
-            # Players who are contributing at least min_contribution
-            pot_players = [p for p in active_players if p.currentbet >= min_contribution]
-
-            # Calculate pot amount
-            pot_amount = min_contribution * len(pot_players)
-
-            # Subtract that amount from each contributing player
-            for p in pot_players:
-                p.currentbet -= min_contribution
-
-            # Save pot info
-            self.pots.append({
-                "amount": pot_amount,
-                "players": pot_players.copy()  # snapshot of contributors
-            })
-
-    
-    def betting_round(self):
-        round_active = True
-        lma = 0
-        while round_active and (Player.players_folded < len(self.players)-1) and (Player.players_all_in < (len(self.players)-1)):
-            round_active = False
-            raise_occurred = False
-            for player in self.players:
-                if player.hasfolded or player.has_gone_all_in or player.is_out():
+            action, amount = self.choose_action(player)
+            if action is None:
+                continue
+            try:
+                return act(self.table, player_id, action, amount)
+            except ActionError as e:
+                if player.number not in self.strategies:
+                    print(f"{player.name}: {e}")
                     continue
-                done = False
-                if lma == player.number:
-                    round_active = False
-                    break
-                while not done:
-                    action = input(f"\n{player.name}, choose an action (fold, check, call, raise): ").lower()
-                    done = True
-                    if action == "fold":
-                        player.fold()
-                        if player.number == len(self.players) and raise_occurred:
-                            round_active = True
-                    elif action == "check":
-                        if not player.check(self.current_highest_bet):
-                            done = False
-                        else:
-                            round_active = False
-                        if player.number == len(self.players) and raise_occurred:
-                            round_active = True
-                    elif action == "call":
-                        if player.call(self.current_highest_bet):
-                            round_active = False
-                        else:
-                            done = False
-                        if player.number == len(self.players) and raise_occurred:
-                            round_active = True
-                    elif action == "raise":
-                        try:
-                            raise_amount = float(input("Enter raise amount: "))
-                        except ValueError:
-                            print("Invalid number. Try again.")
-                            done = False
-                            continue
-                        if player.raise_bet(raise_amount, self.current_highest_bet):
-                            self.current_highest_bet += raise_amount
-                            round_active = True
-                            lma = player.number
-                        else:
-                            done = False
-                        if player.number != 1 and len(self.players) > player.number:
-                            raise_occurred = True
-                        if player.number == len(self.players) and raise_occurred:
-                            round_active = True
-                    else:
-                        print("Invalid action. Try again.")
-                        done = False
-    
+            # A strategy asked for something illegal, check or call instead
+            seat = self.table.seat(player_id)
+            action = "call" if self.table.current_highest_bet > seat.current_bet else "check"
+            return act(self.table, player_id, action)
+
     def calc_hand(self, community_cards, hole_cards):
-        return_list = []
-        self.s = False
-        self.hc = True
-        all_cards = community_cards + hole_cards
-        all_cards.sort(key=lambda card: card.rank)
-        rank_counts = Counter(card.rank for card in all_cards)
-        suit_counts = Counter(card.suit for card in all_cards)
-        self.fk = 4 in rank_counts.values()
-        self.fh = 3 in rank_counts.values() and 2 in rank_counts.values()
-        self.f = any(count >= 5 for count in suit_counts.values())
-        flush_suit = next((suit for suit, count in suit_counts.items() if count >= 5), None)
-        self.tk = 3 in rank_counts.values()
-        self.tp = list(rank_counts.values()).count(2) >= 2
-        self.p = 2 in rank_counts.values()
-        suits = {}
-        royal_ranks = {10, 11, 12, 13, 14}
-        for card in all_cards:
-            suits.setdefault(card.suit, []).append(card)
-        self.rf = False
-        for suited_cards in suits.values():
-            suited_ranks = set(card.rank for card in suited_cards)
-            if royal_ranks.issubset(suited_ranks):
-                self.rf = True
-                break
-        count = 1
-        duplicates = 0
-        self.sf = False
-        for i in range(len(all_cards)-1, 0, -1):
-            if count == 5:
-                self.s = True
-                sstart = i
-                break
-            if all_cards[i-1].rank - all_cards[i].rank == -1:
-                count += 1
-            else:
-                if all_cards[i-1].rank - all_cards[i].rank != 0:
-                    count = 1
-                else:
-                    duplicates += 1
-        if self.s:
-            flush_count = Counter(card.suit for card in all_cards[sstart:sstart + 5 + duplicates])
-            if 5 in flush_count.values():
-                self.sf = True
-        
-        if self.rf:
-            return_list.append(10)
-            return_list.append(10+11+12+13+14)
-            return_list.append(0)
-            return return_list
-        elif self.sf:
-            return_list.append(9)
-            return_list.append(all_cards[sstart + 4].rank)
-            return return_list
-        elif self.fk:
-            return_list.append(8)
-            fk_rank = next((rank for rank, count in rank_counts.items() if count == 4), None)
-            kicker = max(card.rank for card in all_cards if card.rank != fk_rank)
-            return_list.append(fk_rank)
-            return_list.append(kicker)
-            return return_list
-        elif self.fh:
-            return_list.append(7)
-            return_list.append(next((rank for rank, count in rank_counts.items() if count == 3), None))
-            return_list.append(max((rank for rank, count in rank_counts.items() if count == 2), default=None))
-            return return_list
-        elif self.f:
-            return_list.append(6)
-            flush_cards = [card for card in all_cards if card.suit == flush_suit]
-            flush_cards_sorted = sorted(flush_cards, key=lambda c: c.rank, reverse=True)
-            return_list.append(flush_cards_sorted[0].rank)
-            return_list.append(flush_cards_sorted[1].rank)
-            return_list.append(flush_cards_sorted[2].rank)
-            return_list.append(flush_cards_sorted[3].rank)
-            return_list.append(flush_cards_sorted[4].rank)
-            return return_list
-        elif self.s:
-            return_list.append(5)
-            return_list.append(all_cards[sstart + 4].rank)
-            return return_list
-        elif self.tk:
-            return_list.append(4)
-            trip_rank = max((rank for rank, count in rank_counts.items() if count == 3), default=None)
-            return_list.append(trip_rank)
-            kickers = [card.rank for card in all_cards if card.rank != trip_rank]
-            kickers = sorted(set(kickers), reverse=True)[:2]
-            return_list.extend(kickers)
-            return return_list
-        elif self.tp:
-            pairs = sorted((rank for rank, count in rank_counts.items() if count == 2), reverse=True)
-            pair_rank1, pair_rank2 = pairs[:2]
-            kicker = max(card.rank for card in all_cards if card.rank != pair_rank1 and card.rank != pair_rank2)
-            return_list.append(3)
-            return_list.append(pair_rank1)
-            return_list.append(pair_rank2)
-            return_list.append(kicker)
-            return return_list
-        elif self.p:
-            return_list.append(2)
-            pair_rank = max((rank for rank, count in rank_counts.items() if count == 2), default=None)
-            return_list.append(pair_rank)
-            kickers = [card.rank for card in all_cards if card.rank != pair_rank]
-            kickers = sorted(set(kickers), reverse=True)[:3]
-            return_list.extend(kickers)
-            return return_list
-        elif self.hc:
-            return_list.append(1)
-            return_list.append(all_cards[-1].rank)
-            return_list.append(all_cards[-2].rank)
-            return_list.append(all_cards[-3].rank)
-            return_list.append(all_cards[-4].rank)
-            return_list.append(all_cards[-5].rank)
-            return return_list
-    
+        return evaluate_cards(community_cards + hole_cards)
+
     def play_game(self):
         # Reset each player
         for player in self.players:
             player.reset_all()
-
-        self.community_cards = []
         self.pots = []
-        self.current_highest_bet = 0
-        self.deck = Deck()
-
-        self.deck.shuffle()
-        self.deal_hole_cards()
-        print("Hole cards dealt.")
-
-        print("\nStarting betting round:")
-        self.betting_round()
-
-        print("\nDealing the flop:")
-        self.deal_flop()
-        print("Community cards:", self.community_cards)
-
-        print("\nStarting betting round:")
-        self.betting_round()
-
-        print("\nDealing the turn:")
-        self.deal_turn()
-        print("Community cards:", self.community_cards)
-
-        print("\nStarting betting round:")
-        self.betting_round()
 
-        print("\nDealing the river:")
-        self.deal_river()
-        print("Community cards:", self.community_cards)
-
-        print("\nFinal betting round:")
-        self.betting_round()
-        print("\nCommunity cards:", self.community_cards)
-        
-        # Update pot
-        self.create_pots()
-        print("Pots are:")
-        for i, pot in enumerate(self.pots):
-            player_names = [player.name for player in pot["players"] if not player.hasfolded]
-            print(f"Pot {i}: ${pot['amount']} between {', '.join(player_names)}")
+        events = start_hand(self.table, self.shuffle_source, first=not self.table.first_hand_completed)
+        while events:
+            if self.verbose:
+                # Players are only looked at between steps to print them
+                self.sync_players()
+                for kind, data in events:
+                    self.show(kind, data)
+            kind, data = events[-1]
+            if kind == "turn":
+                events = self.take_turn(data["player_id"])
+            elif kind == "street_over":
+                events = deal_street(self.table)
+            elif kind in ("runout", "showdown"):
+                events = reveal(self.table) + settle(self.table)
+                self.pots = [
+                    {"amount": pot["amount"], "players": [self.players_by_seat[key] for key in pot["players"]]}
+                    for pot in self.table.pots
+                ]
+            else:
+                self.end_game = kind == "game_over"
+                events = []
+        self.sync_players()
+
+    def show(self, kind, data):
+        """Print one engine event"""
+        table = self.table
+        if kind == "game_over":
+            winner = self.players_by_seat.get(data["winner_id"])
+            print(f"Game over, {winner.name if winner else 'nobody'} has all the chips.")
+        elif kind == "hand_started":
+            self.deal_hole_cards()
+            print("Hole cards dealt.")
+            print("\nStarting betting round:")
+        elif kind == "action":
+            name = self.players_by_seat[data["player_id"]].name
+            if data["action"] == "fold":
+                print(f"{name} folds.")
+            elif data["action"] == "check":
+                print(f"{name} checks.")
+            elif data["action"] == "call":
+                print(f"{name} calls with {data['chips']}")
+            else:
+                print(f"{name} raises to {table.seat(data['player_id']).current_bet}")
+        elif kind == "street":
+            if data["stage"] == "showdown":
+                print("\nCommunity cards:", self.community_cards)
+            else:
+                print(f"\nDealing the {data['stage']}:")
+                print("Community cards:", self.community_cards)
+                print("\nStarting betting round:")
+        elif kind == "runout":
+            print("\nNo further betting possible. Community cards:", self.community_cards)
+        elif kind == "hands_shown":
+            for player_id, score in data["scores"].items():
+                print(f"{self.players_by_seat[player_id].name}: {hand_description(score)}")
+            print("Pots are:")
+            for i, pot in enumerate(table.ledger.pots()):
+                names = ', '.join(self.players_by_seat[key].name for key in pot['players'])
+                print(f"Pot {i}: ${pot['amount']} between {names}")
+        elif kind == "pot_awarded":
+            winner = self.players_by_seat[data["player"]]
+            print(f"Congrats to {winner.name} for winning {data['amount']} from pot {data['pot_index']}")
+
+    def sync_players(self):
+        """Copy the table's seats onto the Player objects"""
+        table = self.table
+        for seat in table.seats:
+            player = self.players_by_seat[seat.id]
+            player.money = seat.money
+            player.currentbet = seat.current_bet
+            player.hasfolded = seat.has_folded
+            player.has_gone_all_in = seat.has_gone_all_in
+            player.holecards = [CARDS[code] for code in seat.holecards]
+            player.handscores = seat.handscores
+            player.last_action = seat.last_action
+            player.isout = seat.money == 0
+        self.community_cards = [CARDS[code] for code in table.community_cards[:table.board_shown]]
 
-        for pot in self.pots:
-            for player in pot["players"]:
-                if player.hasfolded:
-                    continue
-                player.get_hand(self.community_cards, self)
-            winners = []
-            winnerhand = []
-            winnerscore = -1
-            for player in pot["players"]:
-                if player.hasfolded:
-                    continue
-                if player.handscores[0] > winnerscore:
-                    winners = [player]
-                    winnerhand = player.handscores
-                    winnerscore = player.handscores[0]
-                elif player.handscores[0] == winnerscore:    
-                    for i in range(len(winnerhand)):
-                        if player.handscores[i] > winnerhand[i]:
-                            winners = [player]
-                            winnerhand = player.handscores
-                            winnerscore = player.handscores[0]
-                            break
-                        elif player.handscores[i] < winnerhand[i]:
-                            break
-                    else:
-                        winners.append(player)
-            print(f"Congrats to {', '.join((player.name for player in winners))} for winning this pot")
-            for player in winners:
-                player.money += (pot["amount"] / len(winners))
-    
     def to_dict(self):
         return {
             "players": [player.to_dict() for player in self.players],
             "deck": self.deck.to_dict(),
-            "community_cards": [card.to_dict() for card in self.community_cards],
+            "community_cards": [card.code for card in self.community_cards],
             "current_highest_bet": self.current_highest_bet,
+            "hand": self.hand,
+            "shuffle": self.shuffle,
             "pots": [
                 {
                     "amount": pot["amount"],
@@ -332,17 +198,22 @@ class TexasHoldemGame:
         # Recreate players
         players = [Player.from_dict(pdata) for pdata in data["players"]]
 
-        # Recreate deck
-        deck = Deck.from_dict(data["deck"])
-
-        # Recreate community cards
-        community_cards = [Card.from_dict(cdata) for cdata in data["community_cards"]]
-
         # Initialize a new game with players
         game = cls(players)
-        game.deck = deck
-        game.community_cards = community_cards
-        game.current_highest_bet = data["current_highest_bet"]
+        table = game.table
+        table.deck = Deck.from_dict(data["deck"])
+        table.community_cards = list(data["community_cards"])
+        table.board_shown = len(table.community_cards)
+        table.current_highest_bet = data["current_highest_bet"]
+        table.hand = data.get("hand", 1)
+        table.shuffle = data.get("shuffle")
+        game.community_cards = [Card.from_code(code) for code in data["community_cards"]]
+        for player in players:
+            seat = table.seat(str(player.number))
+            seat.holecards = [card.code for card in player.holecards]
+            seat.current_bet = player.currentbet or 0
+            seat.has_folded = player.hasfolded
+            seat.has_gone_all_in = player.has_gone_all_in
 
         # Rebuild pots, mapping player numbers back to player instances
         game.pots = []
@@ -353,4 +224,4 @@ class TexasHoldemGame:
                 "players": pot_players
             })
 
-        return game
\ No newline at end of file
+        return game
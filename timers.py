@@ -0,0 +1,109 @@
+import time
+
+
+class Timer:
+    """One scheduled callback, returned by TimerWheel.schedule"""
+    __slots__ = ("deadline", "callback", "args", "bucket")
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline  # in ticks
+        self.callback = callback
+        self.args = args
+        self.bucket = None  # the set this timer is waiting in, None once fired or cancelled
+
+    def cancel(self):
+        if self.bucket is not None:
+            self.bucket.discard(self)
+            self.bucket = None
+
+    @property
+    def active(self):
+        return self.bucket is not None
+
+
+class TimerWheel:
+    """Hierarchical timer wheel for every table's clocks and pauses
+
+    Level 0 has one slot per tick, each level above covers `slots` times
+    the span of the one below. A timer waits in the lowest level whose
+    current revolution contains its deadline and drops a level each time
+    that slot comes round, so scheduling and cancelling are O(1) and
+    advancing costs one slot per tick plus the timers that move or fire,
+    however many timers are waiting. Deadlines past the top level wait
+    in an overflow set that is looked at once per top-level revolution.
+
+    The wheel does no I/O and has no thread of its own. The owner calls
+    advance() from its event loop and runs the timers it returns.
+    """
+
+    def __init__(self, tick=0.1, slots=64, levels=4, clock=time.monotonic):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self.overflow = set()
+        self.start = clock()
+        self.now = 0  # ticks advanced so far
+
+    def schedule(self, delay, callback, *args):
+        """Run callback(*args) once `delay` seconds from now"""
+        timer = Timer(self._ticks(delay), callback, args)
+        self._place(timer)
+        return timer
+
+    def reschedule(self, timer, delay):
+        """Move a timer, fired or not, to `delay` seconds from now"""
+        timer.cancel()
+        timer.deadline = self._ticks(delay)
+        self._place(timer)
+        return timer
+
+    def _ticks(self, delay):
+        # Round up so a timer never fires early
+        elapsed = self.clock() - self.start
+        return max(self.now + 1, -int(-(elapsed + max(delay, 0)) // self.tick))
+
+    def _place(self, timer):
+        span = 1
+        for level in range(self.levels):
+            if timer.deadline // (span * self.slots) == self.now // (span * self.slots):
+                bucket = self.wheels[level][(timer.deadline // span) % self.slots]
+                break
+            span *= self.slots
+        else:
+            bucket = self.overflow
+        bucket.add(timer)
+        timer.bucket = bucket
+
+    def advance(self):
+        """Move the wheel up to the current time, returns the timers that are due"""
+        due = []
+        target = int((self.clock() - self.start) // self.tick)
+        while self.now < target:
+            self.now += 1
+            # Cascade higher levels whose slot just came round, top first
+            span = self.slots ** self.levels
+            if self.now % span == 0:
+                self._cascade(self.overflow, due)
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.now % span == 0:
+                    self._cascade(self.wheels[level][(self.now // span) % self.slots], due)
+            bucket = self.wheels[0][self.now % self.slots]
+            for timer in bucket:
+                timer.bucket = None
+            due.extend(bucket)
+            bucket.clear()
+        due.sort(key=lambda timer: timer.deadline)
+        return due
+
+    def _cascade(self, bucket, due):
+        timers = list(bucket)
+        bucket.clear()
+        for timer in timers:
+            if timer.deadline <= self.now:
+                timer.bucket = None
+                due.append(timer)
+            else:
+                self._place(timer)
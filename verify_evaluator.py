@@ -0,0 +1,202 @@
+import argparse
+import importlib
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from card import Card
+
+TOTAL_HANDS = 133784560  # C(52, 7)
+
+
+def reference_score(codes):
+    """calc_hand semantics written out plainly, as a comparable tuple
+
+    (category, ranks...) with the same 1-10 categories and tie-break
+    ranks calc_hand has always returned. Unlike the old calc_hand it
+    counts the A-2-3-4-5 wheel as a five-high straight (and straight
+    flush), makes a full house from two sets of trips, and only ever
+    uses five cards.
+    """
+    ranks = sorted((code // 4 + 2 for code in codes), reverse=True)
+    rank_counts = Counter(ranks)
+    suit_counts = Counter(code % 4 for code in codes)
+
+    def straight_high(rank_set):
+        if 14 in rank_set:
+            rank_set = rank_set | {1}
+        for high in range(14, 4, -1):
+            if all(r in rank_set for r in range(high - 4, high + 1)):
+                return high
+        return 0
+
+    flush_suit = next((suit for suit, count in suit_counts.items() if count >= 5), None)
+    if flush_suit is not None:
+        flush_ranks = sorted((code // 4 + 2 for code in codes if code % 4 == flush_suit), reverse=True)
+        high = straight_high(set(flush_ranks))
+        if high == 14:
+            return (10, 14)
+        if high:
+            return (9, high)
+
+    quads = [r for r, c in rank_counts.items() if c == 4]
+    trips = sorted((r for r, c in rank_counts.items() if c == 3), reverse=True)
+    pairs = sorted((r for r, c in rank_counts.items() if c == 2), reverse=True)
+
+    if quads:
+        return (8, quads[0], max(r for r in ranks if r != quads[0]))
+    if trips and (len(trips) > 1 or pairs):
+        return (7, trips[0], max(trips[1:] + pairs))
+    if flush_suit is not None:
+        return (6,) + tuple(flush_ranks[:5])
+    high = straight_high(set(ranks))
+    if high:
+        return (5, high)
+    singles = sorted((r for r, c in rank_counts.items() if c == 1), reverse=True)
+    if trips:
+        return (4, trips[0]) + tuple(singles[:2])
+    if len(pairs) >= 2:
+        return (3, pairs[0], pairs[1], max(pairs[2:] + singles))
+    if pairs:
+        return (2, pairs[0]) + tuple(singles[:3])
+    return (1,) + tuple(singles[:5])
+
+
+def load_candidate(spec):
+    """Import a 'module:function' that scores a list of 7 card codes"""
+    module_name, _, function_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), function_name or "evaluate")
+
+
+# Memo keys for reference_score. Outside flushes the reference only
+# depends on the rank counts, and in a 7-card flush only on the flush
+# suit's ranks, so each memo key is scored once per shard.
+RANK_COUNT = [1 << (3 * (code // 4)) for code in range(52)]
+SUIT_COUNT = [1 << (4 * (code % 4)) for code in range(52)]
+# Adding 3 to each 4-bit suit count sets its top bit once it reaches 5
+FLUSH_CHECK = 0x3333
+FLUSH_SUIT_CARDS = {1 << (4 * suit + 3): sum(1 << code for code in range(suit, 52, 4)) for suit in range(4)}
+
+
+def _check_prefix(args):
+    # One shard: every hand whose two lowest cards are (first, second).
+    # Returns {reference score: {candidate score: example hand}}.
+    spec, first, second = args
+    candidate = load_candidate(spec)
+    references = {}
+    first_seen = {}
+    extra = []
+
+    def visit(codes, rank_key, suit_key, mask):
+        flush = (suit_key + FLUSH_CHECK) & 0x8888
+        memo_key = -(mask & FLUSH_SUIT_CARDS[flush]) if flush else rank_key
+        score = candidate(codes)
+        seen = first_seen.get(memo_key)
+        if seen is None:
+            references[memo_key] = reference_score(codes)
+            first_seen[memo_key] = (score, codes)
+        elif seen[0] != score:
+            extra.append((memo_key, score, codes))
+
+    rank_key = RANK_COUNT[first] + RANK_COUNT[second]
+    suit_key = SUIT_COUNT[first] + SUIT_COUNT[second]
+    mask = (1 << first) | (1 << second)
+    _walk([first, second], second + 1, 5, rank_key, suit_key, mask, visit)
+
+    seen = {}
+    for memo_key, (score, codes) in first_seen.items():
+        seen.setdefault(references[memo_key], {})[score] = codes
+    for memo_key, score, codes in extra:
+        seen[references[memo_key]].setdefault(score, codes)
+    return seen
+
+
+def _walk(codes, start, left, rank_key, suit_key, mask, visit):
+    # Add `left` more cards above `start`, carrying the keys along
+    for code in range(start, 53 - left):
+        next_codes = codes + [code]
+        next_keys = (rank_key + RANK_COUNT[code], suit_key + SUIT_COUNT[code], mask | (1 << code))
+        if left == 1:
+            visit(next_codes, *next_keys)
+        else:
+            _walk(next_codes, code + 1, left - 1, *next_keys, visit)
+
+
+def _merge(total, shard):
+    for reference, by_candidate in shard.items():
+        merged = total.setdefault(reference, {})
+        for score, codes in by_candidate.items():
+            merged.setdefault(score, codes)
+
+
+def _describe(codes):
+    return " ".join(str(Card.from_code(code)) for code in codes)
+
+
+def find_disagreements(seen):
+    """Every place the candidate ordering differs from the reference
+
+    Returns (splits, inversions): reference classes the candidate scores
+    more than one way, and neighbouring reference classes the candidate
+    scores equal or backwards. Together they cover every pair of hands
+    the two evaluators would order differently.
+    """
+    splits = []
+    inversions = []
+    previous = None
+    for reference in sorted(seen):
+        by_candidate = seen[reference]
+        if len(by_candidate) > 1:
+            splits.append((reference, by_candidate))
+        if previous is not None:
+            prev_reference, prev_by_candidate = previous
+            prev_high = max(prev_by_candidate)
+            low = min(by_candidate)
+            if low <= prev_high:
+                inversions.append((prev_reference, prev_by_candidate[prev_high], reference, by_candidate[low]))
+        previous = (reference, by_candidate)
+    return splits, inversions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a hand evaluator against calc_hand semantics on every 7-card hand")
+    parser.add_argument("--candidate", default="evaluator:evaluate", help="module:function scoring a list of card codes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=None, help="only check the first N two-card prefixes (quick runs)")
+    args = parser.parse_args(argv)
+
+    prefixes = [(args.candidate, first, second) for first, second in combinations(range(52), 2) if second <= 46]
+    if args.shards is not None:
+        prefixes = prefixes[:args.shards]
+    hands = sum(math.comb(51 - second, 5) for _, _, second in prefixes)
+    print(f"Checking {args.candidate} on {hands:,} of {TOTAL_HANDS:,} hands with {args.workers} workers")
+
+    start = time.time()
+    seen = {}
+    with ProcessPoolExecutor(args.workers) as executor:
+        for done, shard in enumerate(executor.map(_check_prefix, prefixes, chunksize=4), 1):
+            _merge(seen, shard)
+            if done % 50 == 0 or done == len(prefixes):
+                print(f"  {done}/{len(prefixes)} shards, {time.time() - start:.0f}s")
+
+    splits, inversions = find_disagreements(seen)
+    for reference, by_candidate in splits:
+        print(f"SPLIT {reference}: scored {len(by_candidate)} ways")
+        for score, codes in by_candidate.items():
+            print(f"    {score}: {_describe(codes)}")
+    for low_reference, low_codes, high_reference, high_codes in inversions:
+        print(f"ORDER {low_reference} < {high_reference} but the candidate does not agree")
+        print(f"    {_describe(low_codes)}")
+        print(f"    {_describe(high_codes)}")
+
+    print(f"{len(seen):,} reference classes, {len(splits)} splits, {len(inversions)} ordering disagreements "
+          f"in {time.time() - start:.0f}s")
+    return 1 if splits or inversions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())